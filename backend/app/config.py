@@ -3,31 +3,52 @@ TitanNVR - Application Configuration
 """
 import os
 import sys
-from pathlib import Path
-from pydantic_settings import BaseSettings
+from dataclasses import dataclass, fields
 from functools import lru_cache
+from pathlib import Path
+from dotenv import load_dotenv
+
+
+# config.py -> app/ -> backend/ -> TitanNVR/
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DOCKER_STORAGE_PATH = Path("/app/storage")
 
 
+@lru_cache(maxsize=1)
 def get_absolute_storage_path() -> str:
     """
     Get the absolute storage path based on environment.
     - Docker: /app/storage (mounted volume)
     - Local Windows/Mac: TitanNVR/storage
+    
+    Resolved once per process (cached), so the filesystem is only touched once.
     """
     # Check if running in Docker (Linux + /app/storage exists)
-    docker_path = Path("/app/storage")
-    if sys.platform.startswith('linux') and docker_path.exists():
-        return "/app/storage"
+    if sys.platform.startswith('linux') and DOCKER_STORAGE_PATH.exists():
+        return str(DOCKER_STORAGE_PATH)
     
     # Local development - use project root storage
-    # Go from config.py -> app/ -> backend/ -> TitanNVR/
-    project_root = Path(__file__).parent.parent.parent
-    storage_path = project_root / "storage"
+    storage_path = PROJECT_ROOT / "storage"
     storage_path.mkdir(parents=True, exist_ok=True)
     return str(storage_path)
 
 
-class Settings(BaseSettings):
+def _parse_env_value(raw: str, field_type: type):
+    """Convert a raw environment string to the settings field type."""
+    if field_type is bool:
+        value = raw.strip().lower()
+        if value in ("1", "true", "yes", "on"):
+            return True
+        if value in ("0", "false", "no", "off", ""):
+            return False
+        raise ValueError(f"Invalid boolean value: {raw!r}")
+    if field_type is int:
+        return int(raw)
+    return raw
+
+
+@dataclass(frozen=True)
+class Settings:
     """Application settings loaded from environment variables."""
     
     # Application
@@ -38,6 +59,32 @@ class Settings(BaseSettings):
     # SQLite for development, PostgreSQL for production
     database_url: str = "sqlite+aiosqlite:///./storage/titannvr.db"
     
+    # PostgreSQL connection pool
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
+    db_pool_recycle: int = 300          # Seconds before a connection is recycled
+    db_pool_timeout: int = 30           # Seconds to wait for a free connection
+    db_statement_cache_size: int = 256  # asyncpg prepared statements per connection
+    # Ping connections on checkout - only needed when something between the
+    # app and PostgreSQL (NAT, PgBouncer) drops idle connections early
+    db_pool_pre_ping: bool = False
+    # Behind PgBouncer in transaction pooling mode: asyncpg statement caches
+    # must be disabled (statements would land on other server connections)
+    db_pgbouncer: bool = False
+    
+    # Run create_all on startup. Off in production: the schema is managed by
+    # Alembic (`alembic upgrade head`). SQLite dev databases are always created.
+    auto_create_tables: bool = False
+    
+    # Password hashing (Argon2id). Raise as hardware improves - existing
+    # hashes are upgraded on the user's next login
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536     # KiB (64MB)
+    argon2_parallelism: int = 2
+    
+    # Audit log retention (monthly partitions on PostgreSQL, 0 = keep forever)
+    audit_retention_months: int = 12
+    
     # Go2RTC Configuration
     go2rtc_url: str = "http://go2rtc:1984"
     go2rtc_container: str = "titan-go2rtc"  # Docker container name for restart
@@ -45,12 +92,28 @@ class Settings(BaseSettings):
     # Storage
     storage_path: str = "./storage"
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """
+        Build settings from environment variables.
+        
+        Each field reads its upper-cased name (e.g. DATABASE_URL). Values
+        from `env_file` are loaded first without overriding the real environment.
+        """
+        load_dotenv(env_file, encoding="utf-8", override=False)
+        
+        values = {}
+        for field in fields(cls):
+            raw = os.environ.get(field.name.upper())
+            if raw is not None:
+                values[field.name] = _parse_env_value(raw, field.type)
+        return cls(**values)
+
+
+# Settings don't change for the life of the process - build them once at import
+_settings = Settings.from_env()
 
 
-@lru_cache()
 def get_settings() -> Settings:
-    """Get cached settings instance."""
-    return Settings()
+    """Get the process-wide settings instance."""
+    return _settings
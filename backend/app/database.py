@@ -7,8 +7,10 @@ PostgreSQL provides:
 - Better performance for multiple camera streams
 - Proper connection pooling
 """
+import orjson
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
@@ -18,29 +20,110 @@ settings = get_settings()
 # Determine database type and configure appropriately
 is_sqlite = "sqlite" in settings.database_url
 
+# Dialect-specific INSERT with ON CONFLICT support (same API on both backends)
+if is_sqlite:
+    from sqlalchemy.dialects.sqlite import insert as dialect_insert
+else:
+    from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+
+def json_serializer(value) -> str:
+    """orjson-backed serializer for JSON columns (faster than stdlib json)."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create async engine with appropriate settings
 if is_sqlite:
     # SQLite: For local development only (limited concurrency)
     engine = create_async_engine(
         settings.database_url,
         echo=settings.debug,
+        json_serializer=json_serializer,
+        json_deserializer=orjson.loads,
         connect_args={"check_same_thread": False}
     )
+    
+    # Per-connection PRAGMAs. WAL lets the event/audit writers proceed while
+    # readers (timeline UI) hold snapshots; with WAL, synchronous=NORMAL only
+    # fsyncs at checkpoints and stays corruption-safe. Checkpointing is left
+    # to SQLite's automatic mode (wal_autocheckpoint=1000 pages, ~4MB of WAL).
+    # foreign_keys stays off: Alembic's batch table rebuilds would otherwise
+    # fire ON DELETE CASCADE/SET NULL on the referencing rows.
+    SQLITE_PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA wal_autocheckpoint=1000",
+        "PRAGMA mmap_size=268435456",   # 256MB memory-mapped reads
+        "PRAGMA cache_size=-65536",     # 64MB page cache
+        "PRAGMA temp_store=MEMORY",
+    )
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
 else:
     # PostgreSQL: Production configuration with connection pooling
+    # pool_pre_ping is off by default: it costs a SELECT 1 round-trip on every
+    # checkout, pool_recycle already retires connections before the server
+    # drops them. Enable DB_POOL_PRE_PING when a proxy/NAT cuts idle links.
+    if settings.db_pgbouncer:
+        statement_cache_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+        }
+    else:
+        # Reuse parsed/planned statements for the hot query set
+        statement_cache_args = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+    
     engine = create_async_engine(
         settings.database_url,
         echo=settings.debug,
-        pool_size=10,           # Concurrent connections
-        max_overflow=20,        # Extra connections under load
-        pool_pre_ping=True,     # Verify connections before use
-        pool_recycle=300,       # Recycle connections every 5 minutes
+        pool_size=settings.db_pool_size,            # Concurrent connections
+        max_overflow=settings.db_max_overflow,      # Extra connections under load
+        pool_timeout=settings.db_pool_timeout,      # Fail fast instead of queueing forever
+        pool_recycle=settings.db_pool_recycle,      # Recycle connections periodically
+        pool_pre_ping=settings.db_pool_pre_ping,
+        json_serializer=json_serializer,
+        json_deserializer=orjson.loads,
+        connect_args={
+            **statement_cache_args,
+            "server_settings": {"jit": "off"},
+        },
     )
 
+class TrackedSession(Session):
+    """Session that records whether the current transaction wrote anything."""
+    pass
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    # Bulk insert/update/delete statements bypass the unit of work
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+@event.listens_for(TrackedSession, "after_rollback")
+def _clear_writes(session):
+    session.info.pop("has_writes", None)
+
+
 # Session factory
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=TrackedSession,
     expire_on_commit=False
 )
 
@@ -50,12 +133,28 @@ class Base(DeclarativeBase):
     pass
 
 
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Check if the session has changes that still need to be committed."""
+    return bool(
+        session.info.get("has_writes")
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
+
 async def get_db() -> AsyncSession:
-    """Dependency to get database session."""
+    """
+    Dependency to get database session.
+    
+    Commits only when the request wrote something; read-only requests
+    just release their connection without an extra COMMIT round-trip.
+    """
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            if has_pending_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -64,6 +163,14 @@ async def get_db() -> AsyncSession:
 
 
 async def init_db():
-    """Initialize database tables."""
+    """
+    Initialize database tables.
+    
+    Skipped on PostgreSQL unless AUTO_CREATE_TABLES is set - there the schema
+    comes from Alembic migrations, so startup issues no metadata checks.
+    """
+    if not settings.auto_create_tables and not is_sqlite:
+        return
+    
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -9,29 +9,25 @@ import os
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import select
 
-from app.config import get_settings
+from app.config import get_settings, get_absolute_storage_path
 from app.database import init_db, async_session_maker
-from app.models.camera import Camera
 from app.models.map import Map
 from app.models.event import Event
 from app.models.audit import AuditLog
-from app.routers import cameras_router, health_router, streams_router, maps_router, ptz_router
-from app.routers.events import router as events_router
-from app.routers.recordings import router as recordings_router
-from app.routers.auth import router as auth_router
-from app.routers.settings import router as settings_router, init_default_settings
-from app.routers.audit import router as audit_router
-from app.routers.system import router as system_router
-from app.routers.incidents import router as incidents_router
-from app.routers.cloud import router as cloud_router
-from app.routers.backup import router as backup_router
+from app import routers
+from app.routers import health_router, auth_router, settings_router, cameras_router, streams_router
+from app.routers.cameras import load_active_cameras, push_frigate_config
+from app.routers.settings import init_default_settings
 from app.services.stream_manager import stream_manager
 from app.services.cloud_sync import periodic_cloud_sync
 from app.services.scheduler import periodic_schedule_check
-from app.services.auth import create_default_admin
+from app.services.auth import create_default_admin, HASH_POOL
+from app.services.audit_partitions import maintain_audit_partitions, periodic_audit_partition_maintenance
+from app.services.audit_queue import audit_queue
+from app.services.settings_cache import settings_cache
 
 # Configure logging
 logging.basicConfig(
@@ -42,8 +38,36 @@ logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Max concurrent Go2RTC registrations during startup sync
+GO2RTC_SYNC_CONCURRENCY = 16
+
+# Secondary routers imported during startup instead of at module import,
+# keeping `import app.main` light (mounted before any request is served)
+LAZY_ROUTERS = [
+    "maps_router",
+    "ptz_router",
+    "events_router",
+    "recordings_router",
+    "audit_router",
+    "system_router",
+    "incidents_router",
+    "cloud_router",
+    "backup_router",
+]
+
+
+def include_lazy_routers(app: FastAPI) -> None:
+    """Import and mount the deferred routers (once per app)."""
+    if getattr(app.state, "lazy_routers_loaded", False):
+        return
+    
+    for name in LAZY_ROUTERS:
+        app.include_router(getattr(routers, name), prefix="/api")
+    
+    app.state.lazy_routers_loaded = True
+
 
-async def sync_cameras_to_go2rtc():
+async def sync_cameras_to_go2rtc(cameras: list[dict]):
     """
     Sync all cameras from database to Go2RTC.
     
@@ -57,71 +81,58 @@ async def sync_cameras_to_go2rtc():
         logger.warning("⚠️ Go2RTC is not available, skipping sync")
         return
     
-    async with async_session_maker() as session:
-        result = await session.execute(select(Camera).where(Camera.is_active == True))
-        cameras = result.scalars().all()
-        
-        if not cameras:
-            logger.info("📷 No cameras to sync")
-            return
-        
-        synced = 0
-        failed = 0
-        
-        for camera in cameras:
-            try:
-                await stream_manager.register_stream(
-                    name=camera.name,
-                    main_stream_url=camera.main_stream_url,
-                    sub_stream_url=camera.sub_stream_url
-                )
-                synced += 1
-                logger.debug(f"  ✓ Synced: {camera.name}")
-            except Exception as e:
-                failed += 1
-                logger.error(f"  ✗ Failed to sync {camera.name}: {e}")
-        
-        logger.info(f"✅ Sync complete: {synced} synced, {failed} failed")
+    if not cameras:
+        logger.info("📷 No cameras to sync")
+        return
+    
+    # Register all cameras concurrently (bounded so Go2RTC isn't flooded)
+    semaphore = asyncio.Semaphore(GO2RTC_SYNC_CONCURRENCY)
+    
+    async def register(camera: dict):
+        async with semaphore:
+            return await stream_manager.register_stream(
+                name=camera["name"],
+                main_stream_url=camera["main_stream_url"],
+                sub_stream_url=camera["sub_stream_url"]
+            )
+    
+    results = await asyncio.gather(
+        *(register(camera) for camera in cameras),
+        return_exceptions=True
+    )
+    
+    synced = 0
+    failed = 0
+    
+    for camera, result in zip(cameras, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.error(f"  ✗ Failed to sync {camera['name']}: {result}")
+        else:
+            synced += 1
+            logger.debug(f"  ✓ Synced: {camera['name']}")
+    
+    logger.info(f"✅ Sync complete: {synced} synced, {failed} failed")
 
 
-async def sync_cameras_to_frigate():
+async def sync_cameras_to_frigate(cameras: list[dict]):
     """
     Sync all cameras from database to Frigate.
     
     This runs on startup to ensure Frigate has all camera streams
     configured (in case Frigate container restarted and lost config).
     """
-    from app.services.config_generator import sync_frigate_config
-    
     logger.info("🔄 Syncing cameras to Frigate...")
     
-    async with async_session_maker() as session:
-        result = await session.execute(select(Camera).where(Camera.is_active == True))
-        cameras = result.scalars().all()
-        
-        if not cameras:
-            logger.info("📷 No cameras to sync to Frigate")
-            return
-        
-        camera_dicts = [
-            {
-                "name": c.name,
-                "is_active": c.is_active,
-                "main_stream_url": c.main_stream_url,
-                "sub_stream_url": c.sub_stream_url,
-                "retention_days": c.retention_days,
-                "recording_mode": c.recording_mode,
-                "event_retention_days": c.event_retention_days,
-                "zones_config": c.zones_config,
-            }
-            for c in cameras
-        ]
-        
-        try:
-            result = await sync_frigate_config(camera_dicts, restart=True)
-            logger.info(f"✅ Frigate sync complete: {result.get('cameras_configured', 0)} cameras configured")
-        except Exception as e:
-            logger.warning(f"⚠️ Frigate sync failed (may not be running): {e}")
+    if not cameras:
+        logger.info("📷 No cameras to sync to Frigate")
+        return
+    
+    try:
+        result = await push_frigate_config(cameras)
+        logger.info(f"✅ Frigate sync complete: {result.get('cameras_configured', 0)} cameras configured")
+    except Exception as e:
+        logger.warning(f"⚠️ Frigate sync failed (may not be running): {e}")
 
 
 @asynccontextmanager
@@ -130,35 +141,63 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"🚀 Starting {settings.app_name} Enterprise v2.0...")
     
+    include_lazy_routers(app)
+    
     # Initialize database
     await init_db()
+    await maintain_audit_partitions()
     logger.info("✅ Database initialized")
     
-    # Initialize default admin user and settings
+    # Start the audit log writer (log_action queues entries for it)
+    audit_task = asyncio.create_task(audit_queue.run())
+    
+    # Initialize default admin user and settings, and load the cameras for
+    # the startup syncs - one session (one pool connection) for all of it
     async with async_session_maker() as session:
         await create_default_admin(session)
         await init_default_settings(session)
+        await settings_cache.load(session)
         logger.info("✅ Default admin and settings initialized")
+        
+        cameras = await load_active_cameras(session)
     
-    # Sync cameras to Go2RTC
-    await sync_cameras_to_go2rtc()
-    
-    # Sync cameras to Frigate (ensures detection is configured)
-    await sync_cameras_to_frigate()
+    # Sync cameras to Go2RTC and Frigate (ensures detection is configured).
+    # Independent services, so both syncs run concurrently
+    sync_results = await asyncio.gather(
+        sync_cameras_to_go2rtc(cameras),
+        sync_cameras_to_frigate(cameras),
+        return_exceptions=True
+    )
+    for target, sync_result in zip(("Go2RTC", "Frigate"), sync_results):
+        if isinstance(sync_result, Exception):
+            logger.error(f"❌ Startup sync to {target} failed: {sync_result}")
     
     # Start background task for cloud sync (every 1 hour)
     cloud_sync_task = asyncio.create_task(periodic_cloud_sync(interval_hours=1))
     logger.info("☁️ Cloud sync task started")
     
-    # Start background task for recording scheduler (every 1 minute)
-    scheduler_task = asyncio.create_task(periodic_schedule_check(interval_seconds=60))
+    # Start background task for recording scheduler (wakes on slot boundaries
+    # and schedule changes, 10 minute keepalive)
+    scheduler_task = asyncio.create_task(periodic_schedule_check(interval_seconds=600))
     logger.info("📅 Recording scheduler task started")
     
+    # Start background task for audit_logs partition rollover (daily, PostgreSQL only)
+    partition_task = asyncio.create_task(periodic_audit_partition_maintenance(interval_hours=24))
+    
     yield
     
     # Shutdown
     cloud_sync_task.cancel()
     scheduler_task.cancel()
+    partition_task.cancel()
+    
+    # Stop the audit writer and persist whatever is still queued
+    audit_task.cancel()
+    await asyncio.gather(audit_task, return_exceptions=True)
+    await audit_queue.flush()
+    
+    await stream_manager.close()
+    HASH_POOL.shutdown(wait=False, cancel_futures=True)
     logger.info(f"👋 Shutting down {settings.app_name}...")
 
 
@@ -166,7 +205,8 @@ app = FastAPI(
     title=settings.app_name,
     description="Sistema de videovigilancia empresarial para gestionar cámaras IP",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # Faster serialization for list endpoints
 )
 
 # CORS middleware for frontend communication
@@ -178,26 +218,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
+# Include core routers (the rest are mounted at startup, see LAZY_ROUTERS)
 app.include_router(health_router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
 app.include_router(settings_router, prefix="/api")
 app.include_router(cameras_router, prefix="/api")
 app.include_router(streams_router, prefix="/api")
-app.include_router(events_router, prefix="/api")
-app.include_router(recordings_router, prefix="/api")
-app.include_router(maps_router, prefix="/api")
-app.include_router(ptz_router, prefix="/api")
-app.include_router(audit_router, prefix="/api")
-app.include_router(system_router, prefix="/api")
-app.include_router(incidents_router, prefix="/api")
-app.include_router(cloud_router, prefix="/api")
-app.include_router(backup_router, prefix="/api")
 
 # Mount static files for serving uploaded images (maps, logos, etc.)
 # Use centralized storage path configuration
-from app.config import get_absolute_storage_path
-
 STORAGE_PATH = get_absolute_storage_path()
 os.makedirs(os.path.join(STORAGE_PATH, "maps"), exist_ok=True)
 os.makedirs(os.path.join(STORAGE_PATH, "branding"), exist_ok=True)
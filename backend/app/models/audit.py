@@ -4,11 +4,16 @@ Enterprise v2.0 - Compliance and Activity Tracking
 """
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Integer, DateTime, Text, ForeignKey, Index
+from sqlalchemy import String, Integer, DateTime, Text, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
-from app.database import Base
+from app.database import Base, is_sqlite
+
+
+# Column size limits - keep rows small (well under PostgreSQL's ~2KB TOAST threshold)
+USER_AGENT_MAX_LENGTH = 200
+DETAILS_MAX_LENGTH = 1000
 
 
 class AuditAction:
@@ -88,7 +93,7 @@ class AuditLog(Base):
         nullable=True,
         index=True
     )
-    username: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    username: Mapped[str] = mapped_column(String(100), nullable=False)
     
     # Action details
     action: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
@@ -96,23 +101,51 @@ class AuditLog(Base):
     
     # Request context
     ip_address: Mapped[Optional[str]] = mapped_column(String(45), nullable=True)  # IPv6 max length
-    user_agent: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    user_agent: Mapped[Optional[str]] = mapped_column(String(USER_AGENT_MAX_LENGTH), nullable=True)
     
     # Affected resource (for filtering/searching)
     resource_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, index=True)
     resource_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
-    # Timestamp
+    # Timestamp (partition key on PostgreSQL, which requires it in the primary key)
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
-        index=True
+        primary_key=not is_sqlite
     )
     
     # Composite indexes for common queries
     __table_args__ = (
+        # Append-only, time-ordered rows: BRIN on PostgreSQL is a few KB
+        # instead of a full B-tree (SQLite falls back to a regular index)
+        Index(
+            'ix_audit_timestamp_brin',
+            'timestamp',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+        ),
         Index('ix_audit_user_timestamp', 'user_id', 'timestamp'),
         Index('ix_audit_action_timestamp', 'action', 'timestamp'),
+        # list_audit_logs filter shape (time range + action/resource type)
+        Index('ix_audit_ts_action_restype', 'timestamp', 'action', 'resource_type'),
+        # Username prefix search (pattern ops so LIKE 'x%' can use it on PostgreSQL)
+        Index(
+            'ix_audit_username_ts',
+            'username',
+            'timestamp',
+            postgresql_ops={'username': 'varchar_pattern_ops'},
+        ),
+        # History of a specific resource (camera, user, ...)
+        Index('ix_audit_resource', 'resource_type', 'resource_id', 'timestamp'),
+        # Failed logins only (security dashboards) - partial index stays small
+        Index(
+            'ix_audit_failed_logins',
+            'timestamp',
+            postgresql_where=text(f"action = '{AuditAction.LOGIN_FAILED}'"),
+            sqlite_where=text(f"action = '{AuditAction.LOGIN_FAILED}'"),
+        ),
+        # Monthly range partitions on PostgreSQL (see services/audit_partitions.py)
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
     )
     
     def __repr__(self) -> str:
@@ -4,7 +4,8 @@ Enterprise v2.0 with advanced recording configuration
 """
 import enum
 from sqlalchemy import String, Boolean, DateTime, Integer, Enum, Text, Float, ForeignKey, Time, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.types import JSON  # Compatible with PostgreSQL and SQLite
 from datetime import datetime, time
 from typing import Optional, List, TYPE_CHECKING
@@ -23,6 +24,10 @@ class RecordingMode(str, enum.Enum):
     NONE = "none"              # No recording (schedule only)
 
 
+# Valid stored values for Camera.recording_mode
+RECORDING_MODE_VALUES = frozenset(m.value for m in RecordingMode)
+
+
 class Camera(Base):
     """
     Camera model for storing IP camera configurations.
@@ -45,6 +50,9 @@ class Camera(Base):
         updated_at: Timestamp when camera was last modified
     """
     __tablename__ = "cameras"
+    # Fetch server-generated created_at/updated_at in the INSERT/UPDATE
+    # RETURNING itself, so a flushed camera is complete without a refresh
+    __mapper_args__ = {"eager_defaults": True}
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -63,15 +71,22 @@ class Camera(Base):
     
     # Enterprise Recording Configuration
     retention_days: Mapped[int] = mapped_column(Integer, default=7, nullable=False)
-    recording_mode: Mapped[RecordingMode] = mapped_column(
-        Enum(RecordingMode), 
-        default=RecordingMode.MOTION, 
+    # Plain string (RecordingMode value), validated on assignment - avoids
+    # enum coercion on every loaded row
+    recording_mode: Mapped[str] = mapped_column(
+        String(16),
+        default=RecordingMode.MOTION.value,
         nullable=False
     )
     
-    # Detection zones configuration (for future use)
-    # Format: [{"name": "entrance", "coordinates": [[x,y], ...], "objects": ["person"]}]
-    zones_config: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Detection zones configuration, copied verbatim into the Frigate camera config
+    # Format: {"entrance": {"coordinates": "x1,y1,x2,y2,...", "objects": ["person"]}}
+    # Only ever read whole (no per-zone SQL filters), so it is not indexed.
+    # Binary JSONB on PostgreSQL (parsed once on write), JSON text on SQLite
+    zones_config: Mapped[Optional[dict]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=True
+    )
     
     # Event retention (separate from continuous recordings)
     event_retention_days: Mapped[int] = mapped_column(Integer, default=14, nullable=False)
@@ -112,6 +127,14 @@ class Camera(Base):
         back_populates="allowed_cameras"
     )
     
+    @validates("recording_mode")
+    def _validate_recording_mode(self, key: str, value) -> str:
+        """Accept a RecordingMode or its value, store the plain value."""
+        value = getattr(value, "value", value)
+        if value not in RECORDING_MODE_VALUES:
+            raise ValueError(f"Invalid recording mode: {value}")
+        return value
+    
     def __repr__(self) -> str:
         return f"<Camera(id={self.id}, name='{self.name}', mode={self.recording_mode})>"
 
@@ -36,15 +36,15 @@ class Event(Base):
     # Frigate event ID as primary key (string UUID from Frigate)
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
     
-    # Camera identification
-    camera: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    # Camera identification (indexed via ix_events_camera_start)
+    camera: Mapped[str] = mapped_column(String(255), nullable=False)
     
-    # Detection details
-    label: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    # Detection details (label indexed via ix_events_label_start)
+    label: Mapped[str] = mapped_column(String(100), nullable=False)
     score: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Time range
-    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     end_time: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Media availability
@@ -62,9 +62,16 @@ class Event(Base):
     )
     
     # Composite indexes for common queries
+    # (time-range scans lead with start_time, which also covers it alone)
     __table_args__ = (
         Index('ix_events_camera_start', 'camera', 'start_time'),
         Index('ix_events_label_start', 'label', 'start_time'),
+        Index('ix_events_start_camera_label', 'start_time', 'camera', 'label'),
+        # Covering index for event list/timeline columns
+        Index(
+            'ix_events_start_covering',
+            'start_time', 'camera', 'label', 'score', 'has_clip', 'has_snapshot'
+        ),
     )
     
     def __repr__(self) -> str:
@@ -3,7 +3,9 @@ TitanNVR - System Settings Model
 Key-value store for system configuration and branding
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from typing import Any, Optional
+from sqlalchemy import String, Text, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import JSON  # Compatible with PostgreSQL and SQLite
 from app.database import Base
 
@@ -22,15 +24,19 @@ class SystemSettings(Base):
     """
     __tablename__ = "system_settings"
     
-    id = Column(Integer, primary_key=True, index=True)
-    key = Column(String(100), unique=True, nullable=False, index=True)
-    value = Column(Text, nullable=True)
-    value_json = Column(JSON, nullable=True)  # For complex values like SMTP config
-    description = Column(String(255), nullable=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    key: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
+    value: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    value_json: Mapped[Optional[Any]] = mapped_column(JSON, nullable=True)  # For complex values like SMTP config
+    description: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps (evaluated by the database)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now()
+    )
     
     def __repr__(self):
         return f"<SystemSettings(key='{self.key}')>"
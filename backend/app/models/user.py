@@ -3,13 +3,13 @@ TitanNVR - User Model
 Enterprise authentication and role-based access control with granular camera permissions
 """
 import enum
-from datetime import datetime
 from typing import List, TYPE_CHECKING
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, Table, ForeignKey
-from sqlalchemy.orm import relationship, Mapped
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Table, ForeignKey, select, func
+from sqlalchemy.orm import relationship, Mapped, validates
 from app.database import Base
 
 if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
     from app.models.camera import Camera
 
 
@@ -20,6 +20,10 @@ class UserRole(str, enum.Enum):
     VIEWER = "viewer"
 
 
+# Valid stored values for User.role
+USER_ROLE_VALUES = frozenset(r.value for r in UserRole)
+
+
 # Association table for user-camera permissions (many-to-many)
 user_cameras = Table(
     "user_cameras",
@@ -49,7 +53,7 @@ class User(Base):
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(255), unique=True, nullable=True)
     hashed_password = Column(String(255), nullable=False)
-    role = Column(Enum(UserRole), default=UserRole.VIEWER, nullable=False)
+    role = Column(String(16), default=UserRole.VIEWER.value, nullable=False)  # UserRole value
     
     # Account status
     is_active = Column(Boolean, default=True)
@@ -57,25 +61,54 @@ class User(Base):
     # Notification preferences
     receive_email_alerts = Column(Boolean, default=True)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Timestamps (evaluated by the database)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     last_login = Column(DateTime, nullable=True)
     
     # Camera permissions (many-to-many relationship)
-    # For non-admin users, this defines which cameras they can access
+    # For non-admin users, this defines which cameras they can access.
+    # Not eager-loaded: every authenticated request loads the User, and most
+    # don't need permissions - use selectinload(User.allowed_cameras) where needed
     allowed_cameras: Mapped[List["Camera"]] = relationship(
         "Camera",
         secondary=user_cameras,
-        lazy="selectin",
         back_populates="allowed_users"
     )
     
+    @validates("role")
+    def _validate_role(self, key: str, value) -> str:
+        """Accept a UserRole or its value, store the plain value."""
+        value = getattr(value, "value", value)
+        if value not in USER_ROLE_VALUES:
+            raise ValueError(f"Invalid role: {value}")
+        return value
+    
     def __repr__(self):
         return f"<User(username='{self.username}', role='{self.role}')>"
     
-    def can_access_camera(self, camera_id: int) -> bool:
-        """Check if user can access a specific camera."""
+    async def allowed_camera_ids(self, db: "AsyncSession") -> frozenset:
+        """
+        IDs of the cameras this user is assigned (IDs only, no Camera rows).
+        
+        Fetched once per User instance (i.e. per request) and cached, so
+        checking a whole camera grid costs one query plus set lookups.
+        """
+        cached = self.__dict__.get("_allowed_camera_ids")
+        if cached is None:
+            result = await db.execute(
+                select(user_cameras.c.camera_id).where(user_cameras.c.user_id == self.id)
+            )
+            cached = frozenset(result.scalars().all())
+            self.__dict__["_allowed_camera_ids"] = cached
+        return cached
+    
+    def reset_allowed_camera_ids(self) -> None:
+        """Drop the cached camera ID set (after changing allowed_cameras)."""
+        self.__dict__.pop("_allowed_camera_ids", None)
+    
+    async def can_access_camera(self, db: "AsyncSession", camera_id: int) -> bool:
+        """Check if user can access a specific camera (O(1) after the first check)."""
         if self.role == UserRole.ADMIN:
             return True
-        return any(c.id == camera_id for c in self.allowed_cameras)
+        return camera_id in await self.allowed_camera_ids(db)
@@ -1,10 +1,38 @@
 """
 TitanNVR - API Routers
+
+Routers are resolved lazily (PEP 562 module __getattr__): importing this
+package is cheap, and a router module is only imported the first time its
+`<name>_router` attribute is accessed.
 """
-from app.routers.cameras import router as cameras_router
-from app.routers.health import router as health_router
-from app.routers.streams import router as streams_router
-from app.routers.maps import router as maps_router
-from app.routers.ptz import router as ptz_router
+import importlib
+
+_ROUTERS = {
+    "health_router": "app.routers.health",
+    "auth_router": "app.routers.auth",
+    "settings_router": "app.routers.settings",
+    "cameras_router": "app.routers.cameras",
+    "streams_router": "app.routers.streams",
+    "maps_router": "app.routers.maps",
+    "ptz_router": "app.routers.ptz",
+    "events_router": "app.routers.events",
+    "recordings_router": "app.routers.recordings",
+    "audit_router": "app.routers.audit",
+    "system_router": "app.routers.system",
+    "incidents_router": "app.routers.incidents",
+    "cloud_router": "app.routers.cloud",
+    "backup_router": "app.routers.backup",
+}
+
+
+def __getattr__(name: str):
+    module_name = _ROUTERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    router = importlib.import_module(module_name).router
+    globals()[name] = router  # Cache so later lookups skip __getattr__
+    return router
+
 
-__all__ = ["cameras_router", "health_router", "streams_router", "maps_router", "ptz_router"]
+__all__ = list(_ROUTERS)
@@ -2,15 +2,19 @@
 TitanNVR - Audit Log Router
 Enterprise v2.0 - Compliance and Activity Tracking API
 """
+import base64
+import binascii
 import logging
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.audit import AuditLog, AuditAction
+from app.models.audit import AuditLog, AuditAction, USER_AGENT_MAX_LENGTH
 from app.models.user import User
 from app.schemas.audit import (
     AuditLogResponse,
@@ -19,6 +23,7 @@ from app.schemas.audit import (
     AuditStats
 )
 from app.services.auth import require_admin, get_current_user_required
+from app.services.audit_queue import audit_queue, AuditDetails
 
 logger = logging.getLogger(__name__)
 
@@ -29,15 +34,23 @@ router = APIRouter(prefix="/audit", tags=["audit"])
 # Utility Function: log_action
 # ============================================================
 
+@lru_cache(maxsize=256)
+def intern_user_agent(user_agent: str) -> str:
+    """Truncate and intern a User-Agent so repeat clients share one string."""
+    return sys.intern(user_agent[:USER_AGENT_MAX_LENGTH])
+
+
 async def log_action(
-    db: AsyncSession,
     user: Optional[User],
     action: str,
-    details: str,
+    details: Optional[str] = None,
     request: Optional[Request] = None,
     resource_type: Optional[str] = None,
-    resource_id: Optional[str] = None
-) -> AuditLog:
+    resource_id: Optional[str] = None,
+    immediate: bool = False,
+    template: Optional[str] = None,
+    params: Optional[dict] = None
+) -> None:
     """
     Log an audit action to the database.
     
@@ -48,20 +61,26 @@ async def log_action(
     - Export operations
     
     Args:
-        db: Database session
         user: User performing the action (None for system actions)
         action: Action type from AuditAction constants
         details: Human-readable description of what happened
         request: FastAPI Request object to extract IP and user agent
         resource_type: Type of affected resource (camera, user, etc.)
         resource_id: ID of the affected resource
+        immediate: Persist before returning instead of queueing
+        template: Details template ID (see AUDIT_DETAIL_TEMPLATES), used
+            instead of `details` - formatted by the queue writer, not here
+        params: Parameters for `template`
     
-    Returns:
-        Created AuditLog entry
+    Entries are queued and written in batches by the audit queue writer,
+    in its own session. They are not part of the caller's transaction: an
+    entry is recorded even if the caller's commit later fails or is rolled
+    back, so log after the change has been committed where that matters.
+    Use immediate=True for audits that must be stored before the response
+    (e.g. failed logins).
     
     Example:
         await log_action(
-            db=db,
             user=current_user,
             action=AuditAction.CAMERA_DELETE,
             details=f"Deleted camera '{camera.name}' (ID: {camera.id})",
@@ -75,32 +94,61 @@ async def log_action(
     user_agent = None
     
     if request:
-        # Get client IP (handle proxies)
-        ip_address = request.client.host if request.client else None
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        headers = request.headers
+        
+        # Get client IP (handle proxies) - first hop only, without splitting the whole list
+        forwarded_for = headers.get("X-Forwarded-For")
         if forwarded_for:
-            ip_address = forwarded_for.split(",")[0].strip()
+            ip_address = forwarded_for.partition(",")[0].strip()
+        elif request.client:
+            ip_address = request.client.host
         
-        user_agent = request.headers.get("User-Agent", "")[:500]  # Truncate if too long
+        user_agent = intern_user_agent(headers.get("User-Agent", ""))
     
-    # Create audit log entry
-    audit_entry = AuditLog(
-        user_id=user.id if user else None,
-        username=user.username if user else "SYSTEM",
-        action=action,
-        details=details,
-        ip_address=ip_address,
-        user_agent=user_agent,
-        resource_type=resource_type,
-        resource_id=resource_id
-    )
+    if template is not None:
+        details = AuditDetails(template, params or {})
     
-    db.add(audit_entry)
-    await db.flush()  # Get the ID without committing
-    
-    logger.info(f"[AUDIT] {audit_entry.username}: {action} - {details}")
+    # Create audit log entry (timestamped now, not when the batch is written).
+    # Details are truncated and logged by the writer (render_entry)
+    entry = {
+        "user_id": user.id if user else None,
+        "username": user.username if user else "SYSTEM",
+        "action": action,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "timestamp": datetime.now(timezone.utc),
+    }
     
-    return audit_entry
+    if immediate:
+        await audit_queue.write_now(entry)
+    else:
+        await audit_queue.put(entry)
+
+
+# ============================================================
+# Keyset Pagination Cursors
+# ============================================================
+
+def encode_audit_cursor(log: AuditLog) -> str:
+    """Encode the (timestamp, id) position of a log entry as an opaque cursor."""
+    raw = f"{log.timestamp.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_audit_cursor(cursor: str) -> tuple:
+    """Decode a cursor back into (timestamp, id). Raises 400 if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, log_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
 
 # ============================================================
@@ -116,6 +164,7 @@ async def list_audit_logs(
     end_time: Optional[datetime] = None,
     page: int = 1,
     page_size: int = 50,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
@@ -123,15 +172,20 @@ async def list_audit_logs(
     List audit logs with filtering and pagination.
     
     Admin only endpoint for compliance review and security auditing.
-    """
-    # Build query with filters
-    query = select(AuditLog)
-    count_query = select(func.count(AuditLog.id))
     
+    Pagination is keyset-based: each response carries `next_cursor`, pass it
+    back as `cursor` for the next page (constant cost at any depth). `page`
+    (OFFSET) is still honored when no cursor is given, but is deprecated.
+    """
     filters = []
     
     if username:
-        filters.append(AuditLog.username.ilike(f"%{username}%"))
+        if "*" in username:
+            # Explicit wildcards: case-insensitive pattern match
+            filters.append(AuditLog.username.ilike(username.replace("*", "%")))
+        else:
+            # Plain input: prefix match, can use ix_audit_username_ts
+            filters.append(AuditLog.username.startswith(username, autoescape=True))
     
     if action:
         filters.append(AuditLog.action == action)
@@ -145,29 +199,52 @@ async def list_audit_logs(
     if end_time:
         filters.append(AuditLog.timestamp <= end_time)
     
-    if filters:
-        query = query.where(and_(*filters))
-        count_query = count_query.where(and_(*filters))
-    
-    # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    if cursor:
+        # Seek past the cursor position - no total (endless scroll)
+        cursor_timestamp, cursor_id = decode_audit_cursor(cursor)
+        query = select(AuditLog).where(
+            tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(cursor_timestamp, cursor_id),
+            *filters
+        )
+    else:
+        # First (or OFFSET) page: the total rides along on each row
+        # (COUNT(*) OVER ()) instead of a separate count query
+        query = select(AuditLog, func.count().over().label("total"))
+        if filters:
+            query = query.where(and_(*filters))
+        query = query.offset((page - 1) * page_size)
     
-    # Apply ordering and pagination
-    query = query.order_by(AuditLog.timestamp.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    # One extra row tells whether there is a next page
+    query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(page_size + 1)
     
     result = await db.execute(query)
-    logs = result.scalars().all()
+    rows = result.all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    logs = [row.AuditLog for row in rows]
+    
+    next_cursor = encode_audit_cursor(logs[-1]) if has_more else None
     
-    total_pages = (total + page_size - 1) // page_size
+    if cursor:
+        total = None
+    elif rows:
+        total = rows[0].total
+    elif page > 1:
+        # Past the last page: no rows to carry the total, count separately
+        count_query = select(func.count(AuditLog.id))
+        if filters:
+            count_query = count_query.where(and_(*filters))
+        total = (await db.execute(count_query)).scalar()
+    else:
+        total = 0
     
     return AuditLogList(
         items=[AuditLogResponse.model_validate(log) for log in logs],
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=(total + page_size - 1) // page_size if total is not None else None,
+        next_cursor=next_cursor
     )
 
 
@@ -186,29 +263,17 @@ async def get_audit_stats(
     start_time = end_time - timedelta(days=days)
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
     
-    # Total logs in period
-    total_result = await db.execute(
-        select(func.count(AuditLog.id)).where(
-            AuditLog.timestamp >= start_time
-        )
-    )
-    total_logs = total_result.scalar()
-    
-    # Logs today
-    today_result = await db.execute(
-        select(func.count(AuditLog.id)).where(
-            AuditLog.timestamp >= today_start
-        )
-    )
-    logs_today = today_result.scalar()
-    
-    # Unique users
-    users_result = await db.execute(
-        select(func.count(func.distinct(AuditLog.username))).where(
-            AuditLog.timestamp >= start_time
+    # Totals in a single pass over the range (aggregate FILTER clauses)
+    totals_result = await db.execute(
+        select(
+            func.count(AuditLog.id).filter(AuditLog.timestamp >= start_time),
+            func.count(AuditLog.id).filter(AuditLog.timestamp >= today_start),
+            func.count(func.distinct(AuditLog.username)).filter(AuditLog.timestamp >= start_time),
+        ).where(
+            AuditLog.timestamp >= min(start_time, today_start)
         )
     )
-    unique_users = users_result.scalar()
+    total_logs, logs_today, unique_users = totals_result.one()
     
     # Actions breakdown
     actions_result = await db.execute(
@@ -5,9 +5,10 @@ Enterprise JWT authentication endpoints with audit logging
 from datetime import timedelta
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete, insert
 from pydantic import BaseModel, EmailStr
 import logging
 
@@ -20,8 +21,10 @@ from app.services.auth import (
     AuthService,
     get_current_user_required,
     require_admin,
+    oauth2_scheme,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from app.services.token_cache import token_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -75,6 +78,23 @@ class PasswordChange(BaseModel):
     new_password: str
 
 
+def user_response_fields(user: User) -> dict:
+    """UserResponse fields of a loaded User as a plain dict."""
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "role": user.role,
+        "is_active": user.is_active,
+        "receive_email_alerts": user.receive_email_alerts
+    }
+
+
+def build_user_response(user: User) -> UserResponse:
+    """UserResponse from a loaded User (trusted DB data - validation skipped)."""
+    return UserResponse.model_construct(**user_response_fields(user))
+
+
 # ============================================================
 # Authentication Endpoints
 # ============================================================
@@ -97,13 +117,12 @@ async def login(
     if not user:
         # Log failed login attempt
         await log_action(
-            db=db,
             user=None,
             action=AuditAction.LOGIN_FAILED,
             details=f"Failed login attempt for username: {form_data.username}",
-            request=request
+            request=request,
+            immediate=True
         )
-        await db.commit()
         
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -113,7 +132,6 @@ async def login(
     
     # Log successful login
     await log_action(
-        db=db,
         user=user,
         action=AuditAction.LOGIN,
         details=f"User '{user.username}' logged in successfully",
@@ -121,20 +139,13 @@ async def login(
     )
     
     access_token = AuthService.create_access_token(
-        data={"sub": str(user.id), "role": user.role.value}
+        data={"sub": str(user.id), "role": user.role}
     )
     
     return Token(
         access_token=access_token,
         expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-        user=UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            role=user.role.value,
-            is_active=user.is_active,
-            receive_email_alerts=user.receive_email_alerts
-        )
+        user=build_user_response(user)
     )
 
 
@@ -142,39 +153,38 @@ async def login(
 async def get_current_user_info(
     current_user: User = Depends(get_current_user_required)
 ):
-    """Get current authenticated user information."""
-    return UserResponse(
-        id=current_user.id,
-        username=current_user.username,
-        email=current_user.email,
-        role=current_user.role.value,
-        is_active=current_user.is_active,
-        receive_email_alerts=current_user.receive_email_alerts
-    )
+    """
+    Get current authenticated user information.
+    
+    Returned as an ORJSONResponse, skipping the response_model validation
+    pass (the model stays for the API docs).
+    """
+    return ORJSONResponse(user_response_fields(current_user))
 
 
 @router.post("/logout")
 async def logout(
     request: Request,
     current_user: User = Depends(get_current_user_required),
-    db: AsyncSession = Depends(get_db)
+    token: Optional[str] = Depends(oauth2_scheme)
 ):
     """
     Logout endpoint - logs the logout action for audit purposes.
     
     Note: JWT tokens are stateless, so the actual token invalidation
     should be handled client-side by removing the token from storage.
-    This endpoint just records the logout event for compliance/auditing.
+    This endpoint records the logout event for compliance/auditing and
+    drops the token from the server-side token cache.
     """
+    token_cache.invalidate_token(token)
+    
     # Log the logout action
     await log_action(
-        db=db,
         user=current_user,
         action=AuditAction.LOGOUT,
         details=f"User '{current_user.username}' logged out",
         request=request
     )
-    await db.commit()
     
     logger.info(f"User '{current_user.username}' logged out")
     
@@ -188,7 +198,7 @@ async def change_password(
     db: AsyncSession = Depends(get_db)
 ):
     """Change current user's password."""
-    if not AuthService.verify_password(
+    if not await AuthService.verify_password(
         password_data.current_password, 
         current_user.hashed_password
     ):
@@ -197,10 +207,15 @@ async def change_password(
             detail="Current password is incorrect"
         )
     
-    current_user.hashed_password = AuthService.get_password_hash(
+    # Hash only after the current password checked out. Overlapping the two
+    # would save one hash time on success, but Argon2 can't be interrupted,
+    # so every failed attempt (the path a password guesser drives) would
+    # pay for a hash that gets thrown away.
+    current_user.hashed_password = await AuthService.get_password_hash(
         password_data.new_password
     )
     await db.commit()
+    token_cache.invalidate_user(current_user.id)
     
     return {"message": "Password changed successfully"}
 
@@ -214,20 +229,25 @@ async def list_users(
     admin: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all users (admin only)."""
-    result = await db.execute(select(User).order_by(User.username))
-    users = result.scalars().all()
-    
-    return [
-        UserResponse(
-            id=u.id,
-            username=u.username,
-            email=u.email,
-            role=u.role.value,
-            is_active=u.is_active,
-            receive_email_alerts=u.receive_email_alerts
-        ) for u in users
-    ]
+    """
+    List all users (admin only).
+    
+    Selects only the response columns (no ORM objects) and returns the rows
+    directly as an ORJSONResponse - returning a Response skips the
+    response_model validation pass, which stays for the API docs.
+    """
+    result = await db.execute(
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.role,
+            User.is_active,
+            User.receive_email_alerts
+        ).order_by(User.username)
+    )
+    
+    return ORJSONResponse([row._asdict() for row in result])
 
 
 @router.post("/users", response_model=UserResponse)
@@ -238,17 +258,7 @@ async def create_user(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new user (admin only)."""
-    # Check if username exists
-    result = await db.execute(
-        select(User).where(User.username == user_data.username)
-    )
-    if result.scalar_one_or_none():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already exists"
-        )
-    
-    user = await AuthService.create_user(
+    user = await AuthService.create_user_if_not_exists(
         db,
         username=user_data.username,
         password=user_data.password,
@@ -256,25 +266,23 @@ async def create_user(
         role=user_data.role
     )
     
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already exists"
+        )
+    
     # Log user creation
     await log_action(
-        db=db,
         user=admin,
         action=AuditAction.USER_CREATE,
-        details=f"Created user '{user.username}' with role '{user.role.value}'",
+        details=f"Created user '{user.username}' with role '{user.role}'",
         request=request,
         resource_type="user",
         resource_id=str(user.id)
     )
     
-    return UserResponse(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        role=user.role.value,
-        is_active=user.is_active,
-        receive_email_alerts=user.receive_email_alerts
-    )
+    return build_user_response(user)
 
 
 @router.put("/users/{user_id}", response_model=UserResponse)
@@ -286,8 +294,7 @@ async def update_user(
     db: AsyncSession = Depends(get_db)
 ):
     """Update a user (admin only)."""
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -313,40 +320,30 @@ async def update_user(
     # Handle password reset by admin
     password_reset = False
     if user_data.password is not None and user_data.password.strip():
-        user.hashed_password = AuthService.get_password_hash(user_data.password)
+        user.hashed_password = await AuthService.get_password_hash(user_data.password)
         password_reset = True
         changes.append("password_reset")
     
     await db.commit()
+    token_cache.invalidate_user(user.id)
     await db.refresh(user)
     
     # Log the update action
-    details = f"Updated user '{user.username}'"
-    if changes:
-        details += f": {', '.join(changes)}"
-    if password_reset:
-        details = f"Password reset for user '{user.username}'"
-        if len(changes) > 1:
-            details += f" + other changes: {', '.join(c for c in changes if c != 'password_reset')}"
-    
     await log_action(
-        db=db,
         user=admin,
         action=AuditAction.USER_UPDATE,
-        details=details,
+        template="user_update",
+        params={
+            "username": user.username,
+            "changes": changes,
+            "password_reset": password_reset
+        },
         request=request,
         resource_type="user",
         resource_id=str(user.id)
     )
     
-    return UserResponse(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        role=user.role.value,
-        is_active=user.is_active,
-        receive_email_alerts=user.receive_email_alerts
-    )
+    return build_user_response(user)
 
 
 @router.delete("/users/{user_id}")
@@ -363,8 +360,7 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -378,7 +374,6 @@ async def delete_user(
     
     # Log user deletion
     await log_action(
-        db=db,
         user=admin,
         action=AuditAction.USER_DELETE,
         details=f"Deleted user '{username}'",
@@ -388,6 +383,7 @@ async def delete_user(
     )
     
     await db.commit()
+    token_cache.invalidate_user(user_id)
     
     return {"message": f"User {username} deleted"}
 
@@ -421,9 +417,12 @@ async def get_user_permissions(
     
     Returns list of camera IDs the user can access.
     Note: Admins have implicit access to all cameras.
+    
+    Only Camera id/name are selected (no ORM rows), so stream URLs and
+    zone configs are never fetched. The result goes out as an ORJSONResponse,
+    skipping the response_model validation pass.
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -431,25 +430,22 @@ async def get_user_permissions(
             detail="User not found"
         )
     
+    cameras_query = select(Camera.id, Camera.name).order_by(Camera.id)
     # For admins, return all cameras
-    if user.role == UserRole.ADMIN:
-        cameras_result = await db.execute(select(Camera))
-        all_cameras = cameras_result.scalars().all()
-        return UserPermissionsResponse(
-            user_id=user.id,
-            username=user.username,
-            role=user.role.value,
-            camera_ids=[c.id for c in all_cameras],
-            camera_names=[c.name for c in all_cameras]
-        )
+    if user.role != UserRole.ADMIN:
+        cameras_query = cameras_query.join(
+            user_cameras, user_cameras.c.camera_id == Camera.id
+        ).where(user_cameras.c.user_id == user.id)
     
-    return UserPermissionsResponse(
-        user_id=user.id,
-        username=user.username,
-        role=user.role.value,
-        camera_ids=[c.id for c in user.allowed_cameras],
-        camera_names=[c.name for c in user.allowed_cameras]
-    )
+    rows = (await db.execute(cameras_query)).all()
+    
+    return ORJSONResponse({
+        "user_id": user.id,
+        "username": user.username,
+        "role": user.role,
+        "camera_ids": [row.id for row in rows],
+        "camera_names": [row.name for row in rows]
+    })
 
 
 @router.put("/users/{user_id}/permissions", response_model=UserPermissionsResponse)
@@ -468,8 +464,9 @@ async def update_user_permissions(
     
     Note: Cannot modify permissions for admin users (they have full access).
     """
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # The association rows are rewritten with Core statements below,
+    # so the allowed_cameras collection is never loaded
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -484,12 +481,12 @@ async def update_user_permissions(
             detail="Cannot modify permissions for admin users - they have full access"
         )
     
-    # Validate camera IDs exist
+    # Validate camera IDs exist (id/name only - no Camera objects needed)
     if permissions.camera_ids:
         cameras_result = await db.execute(
-            select(Camera).where(Camera.id.in_(permissions.camera_ids))
+            select(Camera.id, Camera.name).where(Camera.id.in_(permissions.camera_ids))
         )
-        valid_cameras = cameras_result.scalars().all()
+        valid_cameras = cameras_result.all()
         valid_ids = {c.id for c in valid_cameras}
         
         invalid_ids = set(permissions.camera_ids) - valid_ids
@@ -501,23 +498,36 @@ async def update_user_permissions(
     else:
         valid_cameras = []
     
-    # Clear existing permissions
-    user.allowed_cameras.clear()
-    
-    # Add new permissions
-    for camera in valid_cameras:
-        user.allowed_cameras.append(camera)
+    # Only touch the association rows that change: unchanged permissions
+    # cost no writes, and an identical list costs none at all
+    old_ids = set(await user.allowed_camera_ids(db))
+    new_ids = {c.id for c in valid_cameras}
+    to_remove = old_ids - new_ids
+    to_add = new_ids - old_ids
+    
+    if to_remove:
+        await db.execute(
+            delete(user_cameras).where(
+                user_cameras.c.user_id == user.id,
+                user_cameras.c.camera_id.in_(to_remove)
+            )
+        )
+    if to_add:
+        await db.execute(
+            insert(user_cameras),
+            [{"user_id": user.id, "camera_id": camera_id} for camera_id in to_add]
+        )
+    user.reset_allowed_camera_ids()
     
     await db.commit()
-    await db.refresh(user)
     
     # Log the permission change
     camera_names = [c.name for c in valid_cameras]
     await log_action(
-        db=db,
         user=admin,
         action=AuditAction.USER_UPDATE,
-        details=f"Updated camera permissions for user '{user.username}': {len(valid_cameras)} cameras ({', '.join(camera_names[:5])}{'...' if len(camera_names) > 5 else ''})",
+        template="user_permissions",
+        params={"username": user.username, "camera_names": camera_names},
         request=request,
         resource_type="user",
         resource_id=str(user.id)
@@ -525,10 +535,10 @@ async def update_user_permissions(
     
     logger.info(f"Permissions updated for user '{user.username}': {len(valid_cameras)} cameras")
     
-    return UserPermissionsResponse(
+    return UserPermissionsResponse.model_construct(
         user_id=user.id,
         username=user.username,
-        role=user.role.value,
-        camera_ids=[c.id for c in user.allowed_cameras],
-        camera_names=[c.name for c in user.allowed_cameras]
+        role=user.role,
+        camera_ids=[c.id for c in valid_cameras],
+        camera_names=camera_names
     )
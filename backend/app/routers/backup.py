@@ -2,30 +2,51 @@
 TitanNVR - Backup & Restore System
 Export and import system configuration for disaster recovery
 """
-import json
+import asyncio
+import os
+import ijson
+import orjson
 import logging
 from datetime import datetime
-from typing import Optional, Literal
+from operator import itemgetter
+from typing import Callable, Iterable, Optional, Literal
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select, delete
+from sqlalchemy import select, insert, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
-import io
 
-from app.database import get_db
-from app.models.camera import Camera, CameraSchedule
-from app.models.user import User
+from app.database import get_db, async_session_maker, dialect_insert
+from app.models.camera import Camera, CameraSchedule, RecordingMode, RECORDING_MODE_VALUES
+from app.models.user import User, USER_ROLE_VALUES, user_cameras
 from app.models.settings import SystemSettings
 from app.models.map import Map
-from app.services.auth import require_admin
+from app.services.auth import AuthService, require_admin
+from app.services.settings_cache import settings_cache
 from app.services.stream_manager import stream_manager
+from app.services.token_cache import token_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/system/backup", tags=["backup"])
 
 BACKUP_VERSION = "2.5"
 
+# Tables wiped by a replace-mode import, dependents first
+REPLACE_TABLES = (
+    CameraSchedule.__table__,
+    user_cameras,
+    Camera.__table__,
+    Map.__table__,
+    SystemSettings.__table__,
+)
+
+# Max concurrent Go2RTC registrations after an import
+GO2RTC_SYNC_CONCURRENCY = 16
+
+# Password given to imported users that don't exist yet (must be reset)
+TEMPORARY_PASSWORD = "changeme123"
+
 
 # ============================================================
 # Schemas
@@ -62,60 +83,109 @@ class ImportResult(BaseModel):
 # Helper Functions
 # ============================================================
 
-def serialize_camera(camera: Camera) -> dict:
-    """Serialize camera to dict for export."""
-    return {
-        "id": camera.id,
-        "name": camera.name,
-        "main_stream_url": camera.main_stream_url,
-        "sub_stream_url": camera.sub_stream_url,
-        "is_recording": camera.is_recording,
-        "is_active": camera.is_active,
-        "location": camera.location,
-        "group": camera.group,
-        "retention_days": camera.retention_days,
-        "recording_mode": camera.recording_mode.value if camera.recording_mode else "motion",
-        "event_retention_days": camera.event_retention_days,
-        "zones_config": camera.zones_config,
-        "features_ptz": camera.features_ptz,
-        "map_id": camera.map_id,
-        "map_x": camera.map_x,
-        "map_y": camera.map_y,
-    }
+# Columns exported per table, selected as plain rows (no ORM objects)
+CAMERA_EXPORT_COLUMNS = (
+    Camera.id,
+    Camera.name,
+    Camera.main_stream_url,
+    Camera.sub_stream_url,
+    Camera.is_recording,
+    Camera.is_active,
+    Camera.location,
+    Camera.group,
+    Camera.retention_days,
+    func.coalesce(Camera.recording_mode, "motion").label("recording_mode"),
+    Camera.event_retention_days,
+    Camera.zones_config,
+    Camera.features_ptz,
+    Camera.map_id,
+    Camera.map_x,
+    Camera.map_y,
+)
 
+# Note: password hash is NOT exported for security
+USER_EXPORT_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.role,
+    User.is_active,
+    User.receive_email_alerts,
+)
 
-def serialize_user(user: User) -> dict:
-    """Serialize user to dict for export (excludes password hash for security)."""
-    return {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "role": user.role.value if hasattr(user.role, 'value') else user.role,
-        "is_active": user.is_active,
-        "receive_email_alerts": user.receive_email_alerts,
-        # Note: password hash is NOT exported for security
-    }
+SETTING_EXPORT_COLUMNS = (
+    SystemSettings.id,
+    SystemSettings.key,
+    SystemSettings.value,
+    SystemSettings.value_json,
+    SystemSettings.description,
+)
 
+MAP_EXPORT_COLUMNS = (
+    Map.id,
+    Map.name,
+    Map.image_path,
+    Map.description,
+)
 
-def serialize_setting(setting: SystemSettings) -> dict:
-    """Serialize system setting to dict for export."""
-    return {
-        "id": setting.id,
-        "key": setting.key,
-        "value": setting.value,
-        "value_json": setting.value_json,
-        "description": setting.description,
-    }
 
+# Top-level backup keys and their columns, in file order
+EXPORT_SECTIONS = (
+    ("cameras", CAMERA_EXPORT_COLUMNS),
+    ("users", USER_EXPORT_COLUMNS),
+    ("settings", SETTING_EXPORT_COLUMNS),
+    ("maps", MAP_EXPORT_COLUMNS),
+)
 
-def serialize_map(map_obj: Map) -> dict:
-    """Serialize map to dict for export."""
-    return {
-        "id": map_obj.id,
-        "name": map_obj.name,
-        "image_path": map_obj.image_path,
-        "description": map_obj.description,
-    }
+# Rows fetched from the cursor (and written to the response) per chunk
+EXPORT_BATCH_SIZE = 500
+
+
+async def stream_backup(exported_by: str):
+    """
+    Yield the backup JSON document in chunks, straight from DB cursors.
+    
+    Each section is streamed EXPORT_BATCH_SIZE rows at a time, so memory
+    stays flat however many rows are exported. Non-string keys inside JSON
+    columns are stringified instead of failing.
+    """
+    header = orjson.dumps({
+        "version": BACKUP_VERSION,
+        "timestamp": datetime.now().isoformat(),
+        "exported_by": exported_by,
+    })
+    yield header[:-1]  # Leave the object open for the sections
+    
+    counts = {}
+    try:
+        # Own session: the request's get_db session is closed by the time
+        # the response body is sent
+        async with async_session_maker() as session:
+            for name, columns in EXPORT_SECTIONS:
+                yield b',"' + name.encode() + b'":['
+                
+                result = await session.stream(
+                    select(*columns).execution_options(yield_per=EXPORT_BATCH_SIZE)
+                )
+                count = 0
+                async for rows in result.partitions():
+                    chunk = b",".join(
+                        orjson.dumps(row._asdict(), option=orjson.OPT_NON_STR_KEYS)
+                        for row in rows
+                    )
+                    yield chunk if count == 0 else b"," + chunk
+                    count += len(rows)
+                
+                yield b"]"
+                counts[name] = count
+    except Exception as e:
+        # Headers are already sent - the client sees a truncated download
+        logger.error(f"❌ Backup export failed: {e}")
+        raise
+    
+    yield b"}"
+    
+    logger.info(f"✅ Backup created: {counts['cameras']} cameras, {counts['users']} users, {counts['settings']} settings, {counts['maps']} maps")
 
 
 # ============================================================
@@ -124,69 +194,172 @@ def serialize_map(map_obj: Map) -> dict:
 
 @router.get("/export")
 async def export_backup(
-    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     """
     Export complete system configuration as JSON file.
     
     Includes: Cameras, Users (without passwords), Settings, Maps.
-    Returns downloadable JSON file.
+    Returns downloadable JSON file, streamed as rows are read.
     """
     logger.info(f"📦 Backup export initiated by user: {current_user.username}")
     
-    try:
-        # Fetch all data
-        cameras_result = await db.execute(select(Camera))
-        cameras = cameras_result.scalars().all()
-        
-        users_result = await db.execute(select(User))
-        users = users_result.scalars().all()
-        
-        settings_result = await db.execute(select(SystemSettings))
-        settings = settings_result.scalars().all()
-        
-        maps_result = await db.execute(select(Map))
-        maps = maps_result.scalars().all()
-        
-        # Build backup structure
-        backup_data = {
-            "version": BACKUP_VERSION,
-            "timestamp": datetime.now().isoformat(),
-            "exported_by": current_user.username,
-            "cameras": [serialize_camera(c) for c in cameras],
-            "users": [serialize_user(u) for u in users],
-            "settings": [serialize_setting(s) for s in settings],
-            "maps": [serialize_map(m) for m in maps],
+    # Create filename with date
+    date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"backup_titannvr_{date_str}.json"
+    
+    return StreamingResponse(
+        stream_backup(current_user.username),
+        media_type="application/json",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
         }
-        
-        # Create filename with date
-        date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"backup_titannvr_{date_str}.json"
-        
-        # Convert to JSON string
-        json_content = json.dumps(backup_data, indent=2, ensure_ascii=False)
-        
-        logger.info(f"✅ Backup created: {len(cameras)} cameras, {len(users)} users, {len(settings)} settings, {len(maps)} maps")
-        
-        # Return as downloadable file
-        return StreamingResponse(
-            io.BytesIO(json_content.encode('utf-8')),
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
-        
-    except Exception as e:
-        logger.error(f"❌ Backup export failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Error creating backup: {str(e)}")
+    )
 
 
 # ============================================================
 # Import Endpoint
 # ============================================================
 
+# Top-level scalar event types reported by ijson.parse
+JSON_SCALAR_EVENTS = frozenset(("string", "number", "boolean", "null"))
+
+
+def scan_backup_file(upload) -> tuple[dict, set]:
+    """
+    Parse the whole upload once without building it in memory.
+    
+    Returns the top-level scalar values (version, timestamp, ...) and the
+    set of top-level keys. Raises ijson.JSONError / ValueError if the file
+    is not a single well-formed JSON object.
+    """
+    upload.seek(0)
+    events = ijson.parse(upload, use_float=True)
+    
+    first = next(events, None)
+    if first is None or first[1] != "start_map":
+        raise ValueError("Backup is not a JSON object")
+    
+    header: dict = {}
+    keys: set = set()
+    for prefix, event, value in events:
+        if prefix == "" and event == "map_key":
+            keys.add(value)
+        elif event in JSON_SCALAR_EVENTS and prefix in keys:
+            header[prefix] = value
+    return header, keys
+
+
+def iter_backup_section(upload, name: str):
+    """Yield the records of one top-level backup list, one at a time."""
+    upload.seek(0)
+    return ijson.items(upload, f"{name}.item", use_float=True)
+
+
+# Uploads up to this size are parsed in one orjson call; larger ones are
+# streamed with ijson so memory stays bounded
+BACKUP_IN_MEMORY_MAX_BYTES = 16 * 1024 * 1024
+
+
+def open_backup_file(upload) -> tuple[dict, set, Callable[[str], Iterable[dict]]]:
+    """
+    Validate an uploaded backup and return (header, top-level keys, reader).
+    
+    `reader(name)` iterates the records of one section. Small files take
+    the orjson fast path (one C-level parse); the rest go through
+    scan_backup_file/iter_backup_section. Raises ValueError or
+    ijson.JSONError for invalid files.
+    """
+    size = upload.seek(0, os.SEEK_END)
+    upload.seek(0)
+    
+    if size > BACKUP_IN_MEMORY_MAX_BYTES:
+        header, keys = scan_backup_file(upload)
+        return header, keys, lambda name: iter_backup_section(upload, name)
+    
+    data = orjson.loads(upload.read())
+    if not isinstance(data, dict):
+        raise ValueError("Backup is not a JSON object")
+    
+    header = {
+        key: value for key, value in data.items()
+        if not isinstance(value, (dict, list))
+    }
+    
+    def reader(name: str) -> Iterable[dict]:
+        section = data.get(name)
+        return iter(section if isinstance(section, list) else ())
+    
+    return header, set(data), reader
+
+
+# Records handled (and looked up in the DB) per batch during import
+IMPORT_BATCH_SIZE = 500
+
+
+def iter_batches(records, size: int = IMPORT_BATCH_SIZE):
+    """Group an iterator of records into lists of up to `size`."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def batch_names(batch: list) -> list:
+    """Distinct 'name' values of a batch of records (for IN lookups)."""
+    return list({record["name"] for record in batch if "name" in record})
+
+
+def record_projector(required: tuple, defaults: dict) -> Callable[[dict], dict]:
+    """
+    Build a function projecting a backup record onto a fixed set of fields.
+    
+    The record is laid over `defaults` and every field is picked with one
+    itemgetter call (both done in C) instead of a .get() per field. A
+    missing required field raises KeyError, like record["field"] would.
+    """
+    fields = (*required, *defaults)
+    pick = itemgetter(*fields)
+    
+    def project(record: dict) -> dict:
+        return dict(zip(fields, pick({**defaults, **record})))
+    
+    return project
+
+
+# Fields read from each backup section on import (unknown keys are ignored)
+project_map = record_projector(
+    ("name",),
+    {"image_path": "", "description": None}
+)
+project_setting = record_projector(
+    ("key",),
+    {"value": None, "value_json": None, "description": None}
+)
+project_user = record_projector(
+    ("username",),
+    {"email": None, "role": "viewer", "is_active": True, "receive_email_alerts": True}
+)
+project_camera = record_projector(
+    ("name", "main_stream_url"),
+    {
+        "sub_stream_url": None,
+        "is_active": True,
+        "location": None,
+        "group": None,
+        "retention_days": 7,
+        "recording_mode": "motion",
+        "event_retention_days": 14,
+        "zones_config": None,
+        "features_ptz": False,
+    }
+)
+
+
 @router.post("/import", response_model=ImportResult)
 async def import_backup(
     file: UploadFile = File(...),
@@ -213,251 +386,235 @@ async def import_backup(
     maps_imported = 0
     
     try:
-        # Read and parse file
-        content = await file.read()
+        # Validate the whole file before anything is written; the sections
+        # are then read record by record (streamed for large uploads)
         try:
-            backup_data = json.loads(content.decode('utf-8'))
-        except json.JSONDecodeError:
+            header, sections, read_section = await run_in_threadpool(open_backup_file, file.file)
+        except (ijson.JSONError, ValueError):
             raise HTTPException(status_code=400, detail="Invalid JSON file")
         
         # Validate structure
-        if "version" not in backup_data:
+        if "version" not in header:
             raise HTTPException(status_code=400, detail="Invalid backup file: missing version")
         
-        if "cameras" not in backup_data:
+        if "cameras" not in sections:
             raise HTTPException(status_code=400, detail="Invalid backup file: missing cameras data")
         
-        logger.info(f"📄 Backup version: {backup_data.get('version')}, timestamp: {backup_data.get('timestamp')}")
+        logger.info(f"📄 Backup version: {header.get('version')}, timestamp: {header.get('timestamp')}")
         
         # REPLACE MODE: Clear existing data first
         if mode == "replace":
             logger.warning("⚠️ REPLACE MODE: Clearing existing data...")
             
-            # Delete in correct order (foreign key dependencies)
-            await db.execute(delete(CameraSchedule))
-            await db.execute(delete(Camera))
-            await db.execute(delete(Map))
-            await db.execute(delete(SystemSettings))
+            # Unfiltered DELETEs, children first: SQLite runs them through its
+            # truncate optimization, and on PostgreSQL they only take row
+            # locks, unlike TRUNCATE's ACCESS EXCLUSIVE held until the import
+            # commits. Foreign keys aren't enforced on SQLite, so dependent
+            # rows are cleared explicitly
+            for table in REPLACE_TABLES:
+                await db.execute(delete(table))
             # Don't delete current admin user
             if not skip_admin:
                 await db.execute(delete(User).where(User.id != current_user.id))
             
-            await db.commit()
+            # Not committed yet - the whole import is one transaction
             logger.info("✓ Existing data cleared")
         
         # Import Maps first (cameras may reference them)
-        for map_data in backup_data.get("maps", []):
-            try:
-                if mode == "merge":
-                    # Check if exists by name
-                    existing = await db.execute(
-                        select(Map).where(Map.name == map_data["name"])
-                    )
-                    existing_map = existing.scalar_one_or_none()
+        for batch in iter_batches(read_section("maps")):
+            # Existing maps for the whole batch in one query (merge only)
+            existing_maps = {}
+            if mode == "merge":
+                existing = await db.execute(
+                    select(Map).where(Map.name.in_(batch_names(batch)))
+                )
+                existing_maps = {m.name: m for m in existing.scalars()}
+            
+            for map_data in batch:
+                try:
+                    row = project_map(map_data)
                     
-                    if existing_map:
-                        # Update existing
-                        existing_map.image_path = map_data.get("image_path", "")
-                        existing_map.description = map_data.get("description")
+                    if mode == "merge":
+                        existing_map = existing_maps.get(row["name"])
+                        
+                        if existing_map:
+                            # Update existing
+                            existing_map.image_path = row["image_path"]
+                            existing_map.description = row["description"]
+                        else:
+                            # Create new (without ID to let DB assign)
+                            new_map = Map(**row)
+                            db.add(new_map)
+                            existing_maps[new_map.name] = new_map
                     else:
-                        # Create new (without ID to let DB assign)
-                        new_map = Map(
-                            name=map_data["name"],
-                            image_path=map_data.get("image_path", ""),
-                            description=map_data.get("description")
-                        )
-                        db.add(new_map)
-                else:
-                    # Replace mode: create all
-                    new_map = Map(
-                        name=map_data["name"],
-                        image_path=map_data.get("image_path", ""),
-                        description=map_data.get("description")
-                    )
-                    db.add(new_map)
-                
-                maps_imported += 1
-            except Exception as e:
-                errors.append(f"Map '{map_data.get('name', 'unknown')}': {str(e)}")
-        
-        await db.commit()
+                        # Replace mode: create all
+                        db.add(Map(**row))
+                    
+                    maps_imported += 1
+                except Exception as e:
+                    errors.append(f"Map '{map_data.get('name', 'unknown')}': {str(e)}")
         
-        # Import Settings
-        for setting_data in backup_data.get("settings", []):
+        # Import Settings - one executemany upsert on the unique key
+        # (last entry wins if the file repeats a key)
+        setting_rows = {}
+        for setting_data in read_section("settings"):
             try:
-                if mode == "merge":
-                    existing = await db.execute(
-                        select(SystemSettings).where(SystemSettings.key == setting_data["key"])
-                    )
-                    existing_setting = existing.scalar_one_or_none()
-                    
-                    if existing_setting:
-                        existing_setting.value = setting_data.get("value")
-                        existing_setting.value_json = setting_data.get("value_json")
-                        existing_setting.description = setting_data.get("description")
-                    else:
-                        new_setting = SystemSettings(
-                            key=setting_data["key"],
-                            value=setting_data.get("value"),
-                            value_json=setting_data.get("value_json"),
-                            description=setting_data.get("description")
-                        )
-                        db.add(new_setting)
-                else:
-                    new_setting = SystemSettings(
-                        key=setting_data["key"],
-                        value=setting_data.get("value"),
-                        value_json=setting_data.get("value_json"),
-                        description=setting_data.get("description")
-                    )
-                    db.add(new_setting)
-                
-                settings_imported += 1
+                row = project_setting(setting_data)
+                setting_rows[row["key"]] = row
             except Exception as e:
                 errors.append(f"Setting '{setting_data.get('key', 'unknown')}': {str(e)}")
         
-        await db.commit()
+        if setting_rows:
+            stmt = dialect_insert(SystemSettings.__table__)
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["key"],
+                    set_={
+                        "value": stmt.excluded.value,
+                        "value_json": stmt.excluded.value_json,
+                        "description": stmt.excluded.description,
+                        "updated_at": func.now()
+                    }
+                ),
+                list(setting_rows.values())
+            )
+            settings_imported = len(setting_rows)
         
-        # Import Users (without passwords)
-        for user_data in backup_data.get("users", []):
+        # Import Users (without passwords) - one executemany upsert on the
+        # unique username; existing users keep their password hash
+        user_rows = {}
+        for user_data in read_section("users"):
             try:
+                row = project_user(user_data)
+                
                 # Skip admin user if requested
-                if skip_admin and user_data.get("username") == "admin":
+                if skip_admin and row["username"] == "admin":
                     continue
                 
                 # Skip current user
-                if user_data.get("username") == current_user.username:
+                if row["username"] == current_user.username:
                     continue
                 
-                if mode == "merge":
-                    existing = await db.execute(
-                        select(User).where(User.username == user_data["username"])
-                    )
-                    existing_user = existing.scalar_one_or_none()
-                    
-                    if existing_user:
-                        existing_user.email = user_data.get("email")
-                        existing_user.role = user_data.get("role", "viewer")
-                        existing_user.is_active = user_data.get("is_active", True)
-                        existing_user.receive_email_alerts = user_data.get("receive_email_alerts", True)
-                    else:
-                        # Create user without password (will need reset)
-                        from passlib.context import CryptContext
-                        pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-                        
-                        new_user = User(
-                            username=user_data["username"],
-                            email=user_data.get("email"),
-                            hashed_password=pwd_context.hash("changeme123"),  # Temporary password
-                            role=user_data.get("role", "viewer"),
-                            is_active=user_data.get("is_active", True),
-                            receive_email_alerts=user_data.get("receive_email_alerts", True)
-                        )
-                        db.add(new_user)
-                        errors.append(f"User '{user_data['username']}' created with temporary password 'changeme123'")
-                else:
-                    from passlib.context import CryptContext
-                    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-                    
-                    new_user = User(
-                        username=user_data["username"],
-                        email=user_data.get("email"),
-                        hashed_password=pwd_context.hash("changeme123"),
-                        role=user_data.get("role", "viewer"),
-                        is_active=user_data.get("is_active", True),
-                        receive_email_alerts=user_data.get("receive_email_alerts", True)
-                    )
-                    db.add(new_user)
-                    errors.append(f"User '{user_data['username']}' created with temporary password 'changeme123'")
+                if row["role"] not in USER_ROLE_VALUES:
+                    raise ValueError(f"Invalid role: {row['role']}")
                 
-                users_imported += 1
+                user_rows[row["username"]] = row
             except Exception as e:
                 errors.append(f"User '{user_data.get('username', 'unknown')}': {str(e)}")
         
-        await db.commit()
+        if user_rows:
+            # Users that don't exist yet get a temporary password (will need reset)
+            existing_result = await db.execute(
+                select(User.username).where(User.username.in_(list(user_rows)))
+            )
+            new_usernames = set(user_rows) - set(existing_result.scalars())
+            
+            # One hash for every row, with the app's shared password context
+            # (Argon2id, hashed in the hash pool off the event loop)
+            temp_hash = await AuthService.get_password_hash(TEMPORARY_PASSWORD)
+            
+            stmt = dialect_insert(User.__table__)
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["username"],
+                    set_={
+                        "email": stmt.excluded.email,
+                        "role": stmt.excluded.role,
+                        "is_active": stmt.excluded.is_active,
+                        "receive_email_alerts": stmt.excluded.receive_email_alerts,
+                        "updated_at": func.now()
+                    }
+                ),
+                [{**row, "hashed_password": temp_hash} for row in user_rows.values()]
+            )
+            users_imported = len(user_rows)
+            
+            for username in user_rows:
+                if username in new_usernames:
+                    errors.append(f"User '{username}' created with temporary password '{TEMPORARY_PASSWORD}'")
         
-        # Import Cameras
-        from app.models.camera import RecordingMode
+        # Import Cameras - the stream fields of every imported camera are
+        # kept (last entry per name) for the Go2RTC sync afterwards
+        imported_streams: dict[str, dict] = {}
         
-        for camera_data in backup_data.get("cameras", []):
-            try:
-                # Parse recording mode
-                recording_mode_str = camera_data.get("recording_mode", "motion")
+        for batch in iter_batches(read_section("cameras")):
+            # Existing cameras for the whole batch in one query (merge only)
+            existing_cameras = {}
+            if mode == "merge":
+                existing = await db.execute(
+                    select(Camera).where(Camera.name.in_(batch_names(batch)))
+                )
+                existing_cameras = {c.name: c for c in existing.scalars()}
+            
+            # New cameras are written with one Core executemany INSERT per
+            # batch instead of an ORM add() per row
+            new_rows = []
+            new_by_name = {}
+            
+            for camera_data in batch:
                 try:
-                    recording_mode = RecordingMode(recording_mode_str)
-                except ValueError:
-                    recording_mode = RecordingMode.MOTION
-                
-                if mode == "merge":
-                    existing = await db.execute(
-                        select(Camera).where(Camera.name == camera_data["name"])
-                    )
-                    existing_camera = existing.scalar_one_or_none()
+                    fields = project_camera(camera_data)
+                    name = fields.pop("name")
                     
-                    if existing_camera:
-                        existing_camera.main_stream_url = camera_data["main_stream_url"]
-                        existing_camera.sub_stream_url = camera_data.get("sub_stream_url")
-                        existing_camera.is_active = camera_data.get("is_active", True)
-                        existing_camera.location = camera_data.get("location")
-                        existing_camera.group = camera_data.get("group")
-                        existing_camera.retention_days = camera_data.get("retention_days", 7)
-                        existing_camera.recording_mode = recording_mode
-                        existing_camera.event_retention_days = camera_data.get("event_retention_days", 14)
-                        existing_camera.zones_config = camera_data.get("zones_config")
-                        existing_camera.features_ptz = camera_data.get("features_ptz", False)
+                    # Unknown recording modes fall back to motion (a set
+                    # lookup - no enum construction or exception per row)
+                    if fields["recording_mode"] not in RECORDING_MODE_VALUES:
+                        fields["recording_mode"] = RecordingMode.MOTION.value
+                    
+                    if mode == "merge":
+                        existing_camera = existing_cameras.get(name)
+                        
+                        if existing_camera:
+                            for field, value in fields.items():
+                                setattr(existing_camera, field, value)
+                        elif name in new_by_name:
+                            # Repeated name in the file - last entry wins
+                            new_by_name[name].update(fields)
+                        else:
+                            row = {"name": name, "is_recording": False, **fields}
+                            new_rows.append(row)
+                            new_by_name[name] = row
                     else:
-                        new_camera = Camera(
-                            name=camera_data["name"],
-                            main_stream_url=camera_data["main_stream_url"],
-                            sub_stream_url=camera_data.get("sub_stream_url"),
-                            is_active=camera_data.get("is_active", True),
-                            is_recording=False,
-                            location=camera_data.get("location"),
-                            group=camera_data.get("group"),
-                            retention_days=camera_data.get("retention_days", 7),
-                            recording_mode=recording_mode,
-                            event_retention_days=camera_data.get("event_retention_days", 14),
-                            zones_config=camera_data.get("zones_config"),
-                            features_ptz=camera_data.get("features_ptz", False)
-                        )
-                        db.add(new_camera)
-                else:
-                    new_camera = Camera(
-                        name=camera_data["name"],
-                        main_stream_url=camera_data["main_stream_url"],
-                        sub_stream_url=camera_data.get("sub_stream_url"),
-                        is_active=camera_data.get("is_active", True),
-                        is_recording=False,
-                        location=camera_data.get("location"),
-                        group=camera_data.get("group"),
-                        retention_days=camera_data.get("retention_days", 7),
-                        recording_mode=recording_mode,
-                        event_retention_days=camera_data.get("event_retention_days", 14),
-                        zones_config=camera_data.get("zones_config"),
-                        features_ptz=camera_data.get("features_ptz", False)
-                    )
-                    db.add(new_camera)
-                
-                cameras_imported += 1
-            except Exception as e:
-                errors.append(f"Camera '{camera_data.get('name', 'unknown')}': {str(e)}")
+                        new_rows.append({"name": name, "is_recording": False, **fields})
+                    
+                    imported_streams[name] = fields
+                    cameras_imported += 1
+                except Exception as e:
+                    errors.append(f"Camera '{camera_data.get('name', 'unknown')}': {str(e)}")
+            
+            if new_rows:
+                await db.execute(insert(Camera.__table__), new_rows)
         
+        # Single commit for the whole import: one fsync, and a failure at
+        # any step rolls everything back (including replace-mode deletes)
         await db.commit()
+        settings_cache.invalidate()
+        token_cache.clear()
         
-        # Sync cameras to Go2RTC
+        # Sync imported cameras to Go2RTC (straight from the imported
+        # rows - no re-query; cameras not in the backup are already registered)
         logger.info("🔄 Syncing imported cameras to Go2RTC...")
-        cameras_result = await db.execute(select(Camera).where(Camera.is_active == True))
-        cameras = cameras_result.scalars().all()
+        active_names = [name for name, fields in imported_streams.items() if fields["is_active"]]
         
-        for camera in cameras:
-            try:
-                await stream_manager.register_stream(
-                    name=camera.name,
-                    main_stream_url=camera.main_stream_url,
-                    sub_stream_url=camera.sub_stream_url
+        # Register concurrently (bounded so Go2RTC isn't flooded)
+        semaphore = asyncio.Semaphore(GO2RTC_SYNC_CONCURRENCY)
+        
+        async def register(name: str):
+            fields = imported_streams[name]
+            async with semaphore:
+                return await stream_manager.register_stream(
+                    name=name,
+                    main_stream_url=fields["main_stream_url"],
+                    sub_stream_url=fields["sub_stream_url"]
                 )
-            except Exception as e:
-                errors.append(f"Go2RTC sync for '{camera.name}': {str(e)}")
+        
+        results = await asyncio.gather(
+            *(register(name) for name in active_names),
+            return_exceptions=True
+        )
+        for name, result in zip(active_names, results):
+            if isinstance(result, Exception):
+                errors.append(f"Go2RTC sync for '{name}': {str(result)}")
         
         logger.info(f"✅ Import complete: {cameras_imported} cameras, {users_imported} users, {settings_imported} settings, {maps_imported} maps")
         
@@ -486,18 +643,19 @@ async def get_backup_info(
 ):
     """
     Get information about what would be exported in a backup.
-    """
-    cameras_result = await db.execute(select(Camera))
-    cameras_count = len(cameras_result.scalars().all())
-    
-    users_result = await db.execute(select(User))
-    users_count = len(users_result.scalars().all())
     
-    settings_result = await db.execute(select(SystemSettings))
-    settings_count = len(settings_result.scalars().all())
-    
-    maps_result = await db.execute(select(Map))
-    maps_count = len(maps_result.scalars().all())
+    All four table counts come back in one round-trip (COUNT(*) scalar
+    subqueries - no rows are loaded).
+    """
+    result = await db.execute(
+        select(
+            *(
+                select(func.count()).select_from(model).scalar_subquery()
+                for model in (Camera, User, SystemSettings, Map)
+            )
+        )
+    )
+    cameras_count, users_count, settings_count, maps_count = result.one()
     
     return BackupMetadata(
         version=BACKUP_VERSION,
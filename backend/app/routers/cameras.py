@@ -2,15 +2,18 @@
 TitanNVR - Cameras Router
 Enterprise v2.0 with advanced recording configuration
 """
+import asyncio
 import logging
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy import select
+import orjson
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, insert, update, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db, async_session_maker
+from app.database import get_db, async_session_maker, is_sqlite, json_serializer
 from app.models.camera import Camera, RecordingMode, CameraSchedule
-from app.models.user import User, UserRole
+from app.models.user import User, UserRole, user_cameras
 from app.services.auth import get_current_user_required
 from app.schemas.camera import (
     CameraCreate, CameraUpdate, CameraResponse, RECORDING_MODES_INFO,
@@ -19,43 +22,167 @@ from app.schemas.camera import (
 )
 from app.services.stream_manager import stream_manager
 from app.services.config_generator import sync_frigate_config
+from app.services.scheduler import scheduler_service
 from datetime import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/cameras", tags=["Cameras"])
 
+# Max concurrent Go2RTC requests when checking/registering many cameras
+GO2RTC_STATUS_CONCURRENCY = 16
+
+# Rows fetched per round-trip when streaming cameras for the Go2RTC/Frigate syncs
+CAMERA_SYNC_BATCH_SIZE = 50
+
+# Bulk creates of at least this many cameras use COPY on PostgreSQL
+# (CameraBulkCreate accepts up to 100 per request)
+CAMERA_COPY_THRESHOLD = 50
+
+# Quiet period after a camera change before the Frigate config is synced
+FRIGATE_SYNC_DELAY = 2.0
+
+# Coalesced Frigate sync state (see schedule_frigate_sync)
+_frigate_sync_lock = asyncio.Lock()
+_frigate_sync_dirty = asyncio.Event()
+_frigate_sync_task: Optional[asyncio.Task] = None
+
+# How long a successful sync is trusted: an unchanged projection only skips
+# the sync within this window, so a frigate.yml reset outside the app is
+# rewritten on the next sync after it
+FRIGATE_SYNC_MAX_AGE = 300.0
+
+# Camera projection pushed by the last successful Frigate sync (any caller
+# of push_frigate_config), and when (event loop clock)
+_frigate_synced_cameras: Optional[list] = None
+_frigate_synced_at: Optional[float] = None
+
 
 # ============================================================
 # Background Task: Sync Frigate Config
 # ============================================================
 
+async def load_active_cameras(session) -> list[dict]:
+    """
+    Load the active cameras as the dicts used by the Go2RTC/Frigate syncs.
+    
+    Shared by the startup syncs and sync_all_to_frigate; only the columns
+    they need are streamed in batches (no ORM entity hydration).
+    """
+    result = await session.stream(
+        select(
+            Camera.name,
+            Camera.is_active,
+            Camera.main_stream_url,
+            Camera.sub_stream_url,
+            Camera.retention_days,
+            Camera.recording_mode,
+            Camera.event_retention_days,
+            Camera.zones_config,
+        )
+        .where(Camera.is_active == True)
+        .order_by(Camera.id)
+        .execution_options(yield_per=CAMERA_SYNC_BATCH_SIZE)
+    )
+    
+    # Rows come back keyed by column name - exactly the dicts the syncs use
+    return [dict(row) async for row in result.mappings()]
+
+
+async def _push_frigate_config(camera_dicts: list[dict]) -> dict:
+    """Write the Frigate config and restart it; caller holds _frigate_sync_lock."""
+    global _frigate_synced_cameras, _frigate_synced_at
+    
+    result = await sync_frigate_config(camera_dicts, restart=True)
+    if result.get("status") == "ok":
+        _frigate_synced_cameras = camera_dicts
+        _frigate_synced_at = asyncio.get_running_loop().time()
+    return result
+
+
+async def push_frigate_config(camera_dicts: list[dict]) -> dict:
+    """
+    Unconditionally sync `camera_dicts` to Frigate (startup and manual syncs).
+    
+    Serialized with sync_all_to_frigate and recorded as the last synced
+    projection, so the next change-triggered sync compares against it.
+    """
+    async with _frigate_sync_lock:
+        return await _push_frigate_config(camera_dicts)
+
+
 async def sync_all_to_frigate():
     """Background task to sync all cameras to Frigate config with enterprise settings"""
-    try:
-        async with async_session_maker() as session:
-            result = await session.execute(select(Camera))
-            cameras = result.scalars().all()
+    # One sync at a time: concurrent config writes + restarts can corrupt the config
+    async with _frigate_sync_lock:
+        try:
+            async with async_session_maker() as session:
+                # Inactive cameras are skipped by the config generator anyway
+                camera_dicts = await load_active_cameras(session)
             
-            # Convert to dicts for config generator including enterprise settings
-            camera_dicts = [
-                {
-                    "name": c.name,
-                    "is_active": c.is_active,
-                    "main_stream_url": c.main_stream_url,
-                    "sub_stream_url": c.sub_stream_url,
-                    # Enterprise settings
-                    "retention_days": c.retention_days,
-                    "recording_mode": c.recording_mode,
-                    "event_retention_days": c.event_retention_days,
-                    "zones_config": c.zones_config,
-                }
-                for c in cameras
-            ]
+            # Nothing Frigate uses changed since a recent sync (e.g. only map
+            # positions were edited) - skip the config write and restart
+            if (
+                camera_dicts == _frigate_synced_cameras
+                and asyncio.get_running_loop().time() - _frigate_synced_at < FRIGATE_SYNC_MAX_AGE
+            ):
+                logger.info("Frigate config unchanged, sync skipped")
+                return
             
-            result = await sync_frigate_config(camera_dicts, restart=True)
+            result = await _push_frigate_config(camera_dicts)
             logger.info(f"Frigate config synced: {result}")
-    except Exception as e:
-        logger.error(f"Failed to sync Frigate config: {e}")
+        except Exception as e:
+            logger.error(f"Failed to sync Frigate config: {e}")
+
+
+async def _frigate_sync_loop():
+    """Wait for changes to settle, then sync once; repeat while more arrive."""
+    global _frigate_sync_task
+    try:
+        while True:
+            await asyncio.sleep(FRIGATE_SYNC_DELAY)
+            _frigate_sync_dirty.clear()
+            await sync_all_to_frigate()
+            if not _frigate_sync_dirty.is_set():
+                return
+    finally:
+        _frigate_sync_task = None
+
+
+def schedule_frigate_sync() -> None:
+    """
+    Request a Frigate config sync after a camera change.
+    
+    Changes within FRIGATE_SYNC_DELAY of each other are coalesced into a
+    single sync (and a single Frigate restart); a change made while a sync
+    is running triggers one more sync once it finishes.
+    """
+    global _frigate_sync_task
+    _frigate_sync_dirty.set()
+    if _frigate_sync_task is None:
+        _frigate_sync_task = asyncio.create_task(_frigate_sync_loop())
+
+
+# Camera columns returned by the list endpoints (the CameraResponse fields)
+CAMERA_RESPONSE_COLUMNS = tuple(getattr(Camera, name) for name in CameraResponse.model_fields)
+
+# Rows fetched per round-trip by the streaming list endpoint
+CAMERA_STREAM_BATCH_SIZE = 200
+
+
+def accessible_cameras_query(user: User):
+    """
+    SELECT of the response columns for the cameras `user` may see.
+    
+    - Admins: See ALL cameras
+    - Operators/Viewers: See only cameras in their `allowed_cameras` list
+      (no permissions = no cameras)
+    """
+    query = select(*CAMERA_RESPONSE_COLUMNS).order_by(Camera.id)
+    if user.role != UserRole.ADMIN:
+        query = query.join(
+            user_cameras, user_cameras.c.camera_id == Camera.id
+        ).where(user_cameras.c.user_id == user.id)
+    return query
 
 
 @router.get("/", response_model=List[CameraResponse])
@@ -70,28 +197,37 @@ async def get_cameras(
     
     - Admins: See ALL cameras
     - Operators/Viewers: See only cameras in their `allowed_cameras` list
+    
+    Paginated in SQL; only the response columns are selected (rows, not
+    ORM entities).
     """
-    if current_user.role == UserRole.ADMIN:
-        # Admins see everything
-        result = await db.execute(
-            select(Camera).offset(skip).limit(limit)
-        )
-        cameras = result.scalars().all()
-    else:
-        # Non-admins only see their assigned cameras
-        allowed_ids = [c.id for c in current_user.allowed_cameras]
-        if not allowed_ids:
-            return []  # No permissions = no cameras
-        
-        result = await db.execute(
-            select(Camera)
-            .where(Camera.id.in_(allowed_ids))
-            .offset(skip)
-            .limit(limit)
-        )
-        cameras = result.scalars().all()
+    result = await db.execute(
+        accessible_cameras_query(current_user).offset(skip).limit(limit)
+    )
+    return result.all()
+
+
+@router.get("/stream")
+async def stream_cameras(
+    current_user: User = Depends(get_current_user_required)
+):
+    """
+    Stream all cameras accessible by the current user as JSON Lines.
+    
+    One CameraResponse object per line, written as rows come off the DB
+    cursor - for clients that need thousands of cameras without paging.
+    """
+    query = accessible_cameras_query(current_user).execution_options(
+        yield_per=CAMERA_STREAM_BATCH_SIZE
+    )
+    
+    async def generate():
+        async with async_session_maker() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                yield b"".join(orjson.dumps(row._asdict()) + b"\n" for row in rows)
     
-    return cameras
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/recording-modes/info")
@@ -110,10 +246,7 @@ async def get_recording_modes_info():
 @router.get("/{camera_id}", response_model=CameraResponse)
 async def get_camera(camera_id: int, db: AsyncSession = Depends(get_db)):
     """Get a specific camera by ID."""
-    result = await db.execute(
-        select(Camera).where(Camera.id == camera_id)
-    )
-    camera = result.scalar_one_or_none()
+    camera = await db.get(Camera, camera_id)
     
     if not camera:
         raise HTTPException(
@@ -126,7 +259,6 @@ async def get_camera(camera_id: int, db: AsyncSession = Depends(get_db)):
 @router.post("/", response_model=CameraResponse, status_code=status.HTTP_201_CREATED)
 async def create_camera(
     camera_data: CameraCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -140,7 +272,6 @@ async def create_camera(
     camera = Camera(**camera_data.model_dump())
     db.add(camera)
     await db.flush()
-    await db.refresh(camera)
     
     # Sync with Go2RTC
     try:
@@ -155,15 +286,52 @@ async def create_camera(
         logger.error(f"Failed to register camera '{camera.name}' in Go2RTC: {e}")
     
     # Sync Frigate config in background
-    background_tasks.add_task(sync_all_to_frigate)
+    schedule_frigate_sync()
     
     return camera
 
 
+async def copy_cameras(db: AsyncSession, rows: List[dict]) -> List[Camera]:
+    """
+    Insert cameras with PostgreSQL COPY (asyncpg copy_records_to_table).
+    
+    COPY skips per-row INSERT overhead but bypasses SQLAlchemy: Python-side
+    column defaults are filled in here and JSON columns are serialized by
+    hand. It returns no IDs, so the created cameras are loaded afterwards
+    with one SELECT by name (names are unique within the batch) and
+    returned in request order. Runs inside the session's transaction.
+    """
+    table = Camera.__table__
+    defaults = {
+        column.name: column.default.arg
+        for column in table.columns
+        if column.default is not None and column.default.is_scalar
+    }
+    columns = [*rows[0], *(name for name in defaults if name not in rows[0])]
+    
+    records = []
+    for row in rows:
+        row = {**defaults, **row}
+        if row["zones_config"] is not None:
+            row["zones_config"] = json_serializer(row["zones_config"])
+        records.append(tuple(row[name] for name in columns))
+    
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name, records=records, columns=columns
+    )
+    
+    result = await db.execute(
+        select(Camera).where(Camera.name.in_([row["name"] for row in rows]))
+    )
+    by_name = {camera.name: camera for camera in result.scalars()}
+    return [by_name[row["name"]] for row in rows]
+
+
 @router.post("/bulk", response_model=CameraBulkResponse)
 async def create_cameras_bulk(
     bulk_data: CameraBulkCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -173,49 +341,77 @@ async def create_cameras_bulk(
     - Registers all streams in Go2RTC
     - Syncs Frigate config once at the end
     """
-    created_cameras = []
+    rows = []
     errors = []
     
-    # Get existing camera names for duplicate check
-    result = await db.execute(select(Camera.name))
-    existing_names = {row[0].lower() for row in result.fetchall()}
+    # Existing cameras clashing with the batch (case-insensitive), in one
+    # IN lookup instead of loading every camera name
+    result = await db.execute(
+        select(func.lower(Camera.name)).where(
+            func.lower(Camera.name).in_(list({c.name.lower() for c in bulk_data.cameras}))
+        )
+    )
+    existing_names = set(result.scalars())
+    
+    # Lowercased names accepted so far in this request
+    batch_names = set()
     
-    # Process each camera
-    for i, camera_data in enumerate(bulk_data.cameras):
+    # Validate each camera
+    for camera_data in bulk_data.cameras:
+        name = camera_data.name.lower()
+        
         # Check for duplicates
-        if camera_data.name.lower() in existing_names:
+        if name in existing_names:
             errors.append(f"Camera '{camera_data.name}' already exists")
             continue
         
         # Check for duplicates within the batch
-        if camera_data.name.lower() in {c.name.lower() for c in created_cameras}:
+        if name in batch_names:
             errors.append(f"Duplicate name in batch: '{camera_data.name}'")
             continue
         
-        try:
-            camera = Camera(**camera_data.model_dump())
-            db.add(camera)
-            await db.flush()
-            await db.refresh(camera)
-            created_cameras.append(camera)
-            existing_names.add(camera_data.name.lower())
-        except Exception as e:
-            errors.append(f"Failed to create '{camera_data.name}': {str(e)}")
+        # Bulk INSERT bypasses the ORM validators: store the plain mode value
+        rows.append({
+            **camera_data.model_dump(),
+            "recording_mode": camera_data.recording_mode.value
+        })
+        batch_names.add(name)
+    
+    created_cameras = []
+    if len(rows) >= CAMERA_COPY_THRESHOLD and not is_sqlite:
+        created_cameras = await copy_cameras(db, rows)
+    elif rows:
+        # One multi-row INSERT for the whole batch (no per-camera unit of
+        # work); RETURNING hands back the created cameras, in request order
+        result = await db.execute(
+            insert(Camera).returning(Camera, sort_by_parameter_order=True),
+            rows
+        )
+        created_cameras = result.scalars().all()
     
     # Commit all changes
     await db.commit()
     
-    # Register all streams in Go2RTC (don't restart after each one)
-    for camera in created_cameras:
-        try:
-            await stream_manager.register_stream(
+    # Register all streams in Go2RTC concurrently (bounded so Go2RTC isn't
+    # flooded; don't restart after each one)
+    semaphore = asyncio.Semaphore(GO2RTC_STATUS_CONCURRENCY)
+    
+    async def register(camera: Camera) -> dict:
+        async with semaphore:
+            return await stream_manager.register_stream(
                 name=camera.name,
                 main_stream_url=camera.main_stream_url,
                 sub_stream_url=camera.sub_stream_url,
                 restart_after=False  # Don't restart for each camera
             )
-        except Exception as e:
-            logger.error(f"Failed to register '{camera.name}' in Go2RTC: {e}")
+    
+    results = await asyncio.gather(
+        *(register(camera) for camera in created_cameras),
+        return_exceptions=True
+    )
+    for camera, register_result in zip(created_cameras, results):
+        if isinstance(register_result, Exception):
+            logger.error(f"Failed to register '{camera.name}' in Go2RTC: {register_result}")
     
     # Restart Go2RTC once at the end if any cameras were created
     if created_cameras:
@@ -223,7 +419,7 @@ async def create_cameras_bulk(
     
     # Sync Frigate config once at the end
     if created_cameras:
-        background_tasks.add_task(sync_all_to_frigate)
+        schedule_frigate_sync()
     
     logger.info(f"Bulk import: {len(created_cameras)} created, {len(errors)} failed")
     
@@ -247,6 +443,10 @@ async def get_camera_groups(db: AsyncSession = Depends(get_db)):
     return {"groups": sorted(groups)}
 
 
+# Camera fields registered in Go2RTC (changing them needs a re-sync)
+STREAM_FIELDS = frozenset(('name', 'main_stream_url', 'sub_stream_url'))
+
+
 @router.patch("/{camera_id}", response_model=CameraResponse)
 async def update_camera(
     camera_id: int,
@@ -257,11 +457,39 @@ async def update_camera(
     Update a camera.
     
     Re-syncs with Go2RTC if stream URLs or name change.
+    
+    Updates that don't touch name/stream URLs need no old values, so they
+    run as a single UPDATE ... RETURNING; the others load the camera first
+    to compare against.
     """
-    result = await db.execute(
-        select(Camera).where(Camera.id == camera_id)
-    )
-    camera = result.scalar_one_or_none()
+    update_data = camera_data.model_dump(exclude_unset=True)
+    
+    if update_data and STREAM_FIELDS.isdisjoint(update_data):
+        if update_data.get('recording_mode') is not None:
+            # Bulk UPDATE bypasses the ORM validators: store the plain value
+            update_data['recording_mode'] = camera_data.recording_mode.value
+        
+        result = await db.execute(
+            update(Camera)
+            .where(Camera.id == camera_id)
+            .values(**update_data)
+            .returning(Camera)
+        )
+        camera = result.scalar_one_or_none()
+        
+        if not camera:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Camera with id {camera_id} not found"
+            )
+        
+        # Re-apply the active schedule if the mode/activation was changed manually
+        if 'recording_mode' in update_data or 'is_active' in update_data:
+            scheduler_service.wake()
+        
+        return camera
+    
+    camera = await db.get(Camera, camera_id)
     
     if not camera:
         raise HTTPException(
@@ -270,10 +498,11 @@ async def update_camera(
         )
     
     # Check if we need to re-sync with Go2RTC
-    update_data = camera_data.model_dump(exclude_unset=True)
+    # Only re-sync when a stream field actually changes (forms often resend
+    # the whole camera unchanged)
     needs_resync = any(
-        field in update_data 
-        for field in ['name', 'main_stream_url', 'sub_stream_url']
+        field in update_data and update_data[field] != getattr(camera, field)
+        for field in STREAM_FIELDS
     )
     old_name = camera.name
     
@@ -282,7 +511,10 @@ async def update_camera(
         setattr(camera, field, value)
     
     await db.flush()
-    await db.refresh(camera)
+    
+    # Re-apply the active schedule if the mode/activation was changed manually
+    if 'recording_mode' in update_data or 'is_active' in update_data:
+        scheduler_service.wake()
     
     # Re-sync with Go2RTC if needed
     if needs_resync:
@@ -304,10 +536,27 @@ async def update_camera(
     return camera
 
 
+async def delete_cameras(db: AsyncSession, camera_ids: List[int]) -> list:
+    """
+    Delete cameras by ID with a single DELETE ... RETURNING.
+    
+    Returns (id, name) rows for the cameras actually deleted. Schedules and
+    user permissions go with them: ON DELETE CASCADE on PostgreSQL, and
+    explicit DELETEs on SQLite, where foreign keys aren't enforced.
+    """
+    if is_sqlite:
+        await db.execute(delete(CameraSchedule).where(CameraSchedule.camera_id.in_(camera_ids)))
+        await db.execute(delete(user_cameras).where(user_cameras.c.camera_id.in_(camera_ids)))
+    
+    result = await db.execute(
+        delete(Camera).where(Camera.id.in_(camera_ids)).returning(Camera.id, Camera.name)
+    )
+    return result.all()
+
+
 @router.delete("/{camera_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_camera(
     camera_id: int,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -315,21 +564,16 @@ async def delete_camera(
     
     Also removes streams from Go2RTC and updates Frigate config.
     """
-    result = await db.execute(
-        select(Camera).where(Camera.id == camera_id)
-    )
-    camera = result.scalar_one_or_none()
+    # Delete from database (one DELETE ... RETURNING, no load first)
+    deleted = await delete_cameras(db, [camera_id])
     
-    if not camera:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Camera with id {camera_id} not found"
         )
     
-    camera_name = camera.name
-    
-    # Delete from database
-    await db.delete(camera)
+    camera_name = deleted[0].name
     
     # Remove from Go2RTC
     try:
@@ -339,7 +583,7 @@ async def delete_camera(
         logger.error(f"Failed to remove camera '{camera_name}' from Go2RTC: {e}")
     
     # Sync Frigate config in background
-    background_tasks.add_task(sync_all_to_frigate)
+    schedule_frigate_sync()
     
     return None
 
@@ -347,7 +591,6 @@ async def delete_camera(
 @router.post("/bulk-delete", response_model=CameraBulkDeleteResponse)
 async def bulk_delete_cameras(
     request: CameraBulkDelete,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -356,49 +599,42 @@ async def bulk_delete_cameras(
     Removes cameras from database, unregisters streams from Go2RTC,
     and regenerates Frigate config once at the end.
     """
-    deleted = 0
-    failed = 0
-    errors = []
-    
-    for camera_id in request.camera_ids:
-        try:
-            # Get camera
-            result = await db.execute(
-                select(Camera).where(Camera.id == camera_id)
-            )
-            camera = result.scalar_one_or_none()
-            
-            if not camera:
-                failed += 1
-                errors.append(f"Camera ID {camera_id} not found")
-                continue
-            
-            camera_name = camera.name
-            
-            # Delete from database
-            await db.delete(camera)
-            
-            # Remove from Go2RTC
-            try:
-                await stream_manager.unregister_stream(camera_name)
-                logger.info(f"Bulk delete: removed '{camera_name}' from Go2RTC")
-            except Exception as e:
-                logger.error(f"Bulk delete: failed to remove '{camera_name}' from Go2RTC: {e}")
-            
-            deleted += 1
-            logger.info(f"Bulk delete: camera '{camera_name}' (ID: {camera_id}) deleted")
-            
-        except Exception as e:
-            failed += 1
-            errors.append(f"Error deleting camera {camera_id}: {str(e)}")
-            logger.error(f"Bulk delete error for camera {camera_id}: {e}")
+    # One DELETE ... RETURNING for the whole request
+    deleted_cameras = await delete_cameras(db, request.camera_ids)
+    deleted_ids = {camera.id for camera in deleted_cameras}
+    
+    errors = [
+        f"Camera ID {camera_id} not found"
+        for camera_id in request.camera_ids
+        if camera_id not in deleted_ids
+    ]
+    deleted = len(deleted_cameras)
+    failed = len(errors)
     
     # Commit all deletions
     await db.commit()
     
+    # Remove from Go2RTC concurrently (bounded so Go2RTC isn't flooded)
+    semaphore = asyncio.Semaphore(GO2RTC_STATUS_CONCURRENCY)
+    
+    async def unregister(name: str) -> dict:
+        async with semaphore:
+            return await stream_manager.unregister_stream(name)
+    
+    results = await asyncio.gather(
+        *(unregister(camera.name) for camera in deleted_cameras),
+        return_exceptions=True
+    )
+    for camera, unregister_result in zip(deleted_cameras, results):
+        if isinstance(unregister_result, Exception):
+            logger.error(f"Bulk delete: failed to remove '{camera.name}' from Go2RTC: {unregister_result}")
+        else:
+            logger.info(f"Bulk delete: removed '{camera.name}' from Go2RTC")
+        logger.info(f"Bulk delete: camera '{camera.name}' (ID: {camera.id}) deleted")
+    
     # Sync Frigate config ONCE at the end (not per camera)
     if deleted > 0:
-        background_tasks.add_task(sync_all_to_frigate)
+        schedule_frigate_sync()
     
     logger.info(f"Bulk delete completed: {deleted} deleted, {failed} failed")
     return CameraBulkDeleteResponse(deleted=deleted, failed=failed, errors=errors)
@@ -415,10 +651,7 @@ async def get_camera_streams(camera_id: int, db: AsyncSession = Depends(get_db))
     
     Returns URLs for WebRTC, MSE, HLS and MJPEG streams.
     """
-    result = await db.execute(
-        select(Camera).where(Camera.id == camera_id)
-    )
-    camera = result.scalar_one_or_none()
+    camera = await db.get(Camera, camera_id)
     
     if not camera:
         raise HTTPException(
@@ -443,10 +676,7 @@ async def get_camera_status(camera_id: int, db: AsyncSession = Depends(get_db)):
         - offline: Stream is not responding
         - unknown: Could not determine status
     """
-    result = await db.execute(
-        select(Camera).where(Camera.id == camera_id)
-    )
-    camera = result.scalar_one_or_none()
+    camera = await db.get(Camera, camera_id)
     
     if not camera:
         raise HTTPException(
@@ -472,19 +702,23 @@ async def get_all_cameras_status(db: AsyncSession = Depends(get_db)):
     Check the real-time connection status of all cameras.
     
     Useful for dashboard to show live connection states.
+    All cameras are checked against a single Go2RTC streams listing, so
+    the response takes one Go2RTC round-trip however many cameras exist.
     """
-    result = await db.execute(select(Camera))
-    cameras = result.scalars().all()
+    result = await db.execute(select(Camera.id, Camera.name, Camera.is_active))
+    cameras = result.all()
     
-    statuses = []
-    for camera in cameras:
-        status_result = await stream_manager.check_stream_status(camera.name)
-        statuses.append({
+    status_by_name = await stream_manager.check_streams_status([camera.name for camera in cameras])
+    
+    statuses = [
+        {
             "camera_id": camera.id,
             "camera_name": camera.name,
-            "connection_status": status_result["status"],
+            "connection_status": status_by_name[camera.name]["status"],
             "is_active": camera.is_active
-        })
+        }
+        for camera in cameras
+    ]
     
     return {"cameras": statuses}
 
@@ -577,8 +811,7 @@ async def get_camera_schedules(
     Returns schedule slots organized by day and time.
     """
     # Verify camera exists
-    result = await db.execute(select(Camera).where(Camera.id == camera_id))
-    camera = result.scalar_one_or_none()
+    camera = await db.get(Camera, camera_id)
     
     if not camera:
         raise HTTPException(
@@ -606,7 +839,6 @@ async def get_camera_schedules(
 async def set_camera_schedules(
     camera_id: int,
     schedule_data: CameraScheduleCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -629,8 +861,7 @@ async def set_camera_schedules(
     **Modes:** continuous, motion, events, none
     """
     # Verify camera exists
-    result = await db.execute(select(Camera).where(Camera.id == camera_id))
-    camera = result.scalar_one_or_none()
+    camera = await db.get(Camera, camera_id)
     
     if not camera:
         raise HTTPException(
@@ -667,8 +898,9 @@ async def set_camera_schedules(
     
     logger.info(f"Camera '{camera.name}' schedules updated: {len(new_schedules)} slots")
     
-    # Trigger scheduler check in background to apply current schedule
-    background_tasks.add_task(sync_all_to_frigate)
+    # Trigger scheduler check to apply current schedule
+    scheduler_service.wake()
+    schedule_frigate_sync()
     
     return CameraSchedulesResponse(
         camera_id=camera.id,
@@ -180,37 +180,17 @@ async def sync_frigate_cameras():
     
     Use this endpoint to force regeneration if cameras are not showing in Frigate.
     """
-    from app.services.config_generator import sync_frigate_config
-    import logging
-    logger = logging.getLogger(__name__)
+    from app.routers.cameras import load_active_cameras, push_frigate_config
     
     async with async_session_maker() as session:
-        result = await session.execute(
-            select(Camera).where(Camera.is_active == True)
-        )
-        cameras = result.scalars().all()
-        
-        logger.info(f"Syncing {len(cameras)} active cameras to Frigate")
-        
-        # Include ALL enterprise settings for proper Frigate configuration
-        camera_dicts = [
-            {
-                "name": c.name,
-                "is_active": c.is_active,
-                "main_stream_url": c.main_stream_url,
-                "sub_stream_url": c.sub_stream_url,
-                # Enterprise settings
-                "retention_days": c.retention_days,
-                "recording_mode": c.recording_mode,
-                "event_retention_days": c.event_retention_days,
-                "zones_config": c.zones_config,
-            }
-            for c in cameras
-        ]
-        
-        for cam in camera_dicts:
-            logger.info(f"  - Camera: {cam['name']} (mode: {cam['recording_mode']})")
-        
-        sync_result = await sync_frigate_config(camera_dicts, restart=True)
-        logger.info(f"Frigate sync result: {sync_result}")
-        return sync_result
+        camera_dicts = await load_active_cameras(session)
+    
+    logger.info(f"Syncing {len(camera_dicts)} active cameras to Frigate")
+    for cam in camera_dicts:
+        logger.info(f"  - Camera: {cam['name']} (mode: {cam['recording_mode']})")
+    
+    # Always pushed (this is the "force" path), and recorded for the
+    # change-triggered syncs in the cameras router
+    sync_result = await push_frigate_config(camera_dicts)
+    logger.info(f"Frigate sync result: {sync_result}")
+    return sync_result
@@ -263,7 +263,7 @@ async def create_evidence_export(
             case_number=request.case_number,
             created_at=now.isoformat(),
             created_by=current_user.username,
-            created_by_role=current_user.role.value,
+            created_by_role=current_user.role,
             operator_notes=request.operator_notes,
             event_count=len(request.event_ids),
             file_count=len(files_manifest),
@@ -302,7 +302,7 @@ Export ID:      {export_id}
 Case Name:      {request.case_name}
 Case Number:    {request.case_number or 'N/A'}
 Created:        {now.strftime('%Y-%m-%d %H:%M:%S')}
-Created By:     {current_user.username} ({current_user.role.value})
+Created By:     {current_user.username} ({current_user.role})
 
 --------------------------------------------------------------------------------
                          CHAIN OF CUSTODY INFORMATION
@@ -360,14 +360,12 @@ To verify file integrity:
         
         # Log to audit
         await log_action(
-            db=db,
             user=current_user,
             action=AuditAction.EVIDENCE_EXPORT,
             details=f"Exported evidence package '{request.case_name}' with {len(request.event_ids)} events ({len(files_manifest)} files, {zip_size / 1024 / 1024:.2f} MB)",
             resource_type="export",
             resource_id=export_id
         )
-        await db.commit()
         
         # Schedule cleanup
         background_tasks.add_task(cleanup_old_exports)
@@ -466,8 +464,7 @@ async def list_exports(
 @router.delete("/{export_id}")
 async def delete_export(
     export_id: str,
-    current_user: User = Depends(require_operator_or_admin),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(require_operator_or_admin)
 ):
     """Delete an evidence export package."""
     zip_path = EXPORTS_DIR / f"{export_id}.zip"
@@ -479,13 +476,11 @@ async def delete_export(
     
     # Log deletion
     await log_action(
-        db=db,
         user=current_user,
         action=AuditAction.EVIDENCE_DELETE,
         details=f"Deleted evidence export package: {export_id}",
         resource_type="export",
         resource_id=export_id
     )
-    await db.commit()
     
     return {"message": f"Export {export_id} deleted"}
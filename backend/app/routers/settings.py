@@ -12,31 +12,18 @@ from pathlib import Path
 import logging
 import shutil
 
-from app.database import get_db
+from app.config import get_absolute_storage_path
+from app.database import get_db, dialect_insert
 from app.models.settings import SystemSettings, DEFAULT_SETTINGS
 from app.models.user import User
 from app.services.auth import get_current_user_required, require_admin
+from app.services.settings_cache import settings_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/settings", tags=["settings"])
 
-# Storage paths - detect if running in Docker or locally
-import os
-
-def get_storage_base() -> Path:
-    """Get the base storage path based on environment."""
-    # Check if running in Docker (path /app exists)
-    if Path("/app/storage").exists():
-        return Path("/app/storage")
-    
-    # Running locally - use project root /storage folder
-    # Path: backend/app/routers/settings.py -> go up 4 levels to project root
-    project_root = Path(__file__).parent.parent.parent.parent
-    local_storage = project_root / "storage"
-    local_storage.mkdir(parents=True, exist_ok=True)
-    return local_storage
-
-STORAGE_BASE = get_storage_base()
+# Storage paths - shared resolution with main.py/maps.py (Docker vs local)
+STORAGE_BASE = Path(get_absolute_storage_path())
 BRANDING_DIR = STORAGE_BASE / "branding"
 LOGO_PATH = BRANDING_DIR / "logo.png"
 MAX_LOGO_SIZE = 2 * 1024 * 1024  # 2MB
@@ -105,25 +92,13 @@ async def get_public_settings(db: AsyncSession = Depends(get_db)):
     Get public settings for frontend branding.
     
     No authentication required - used for login page and initial load.
+    Served from the in-process settings cache (no query per request).
     """
-    settings = {}
-    
-    result = await db.execute(
-        select(SystemSettings).where(
-            SystemSettings.key.in_([
-                "system_title", "theme_color", "logo_url", "company_name"
-            ])
-        )
-    )
-    
-    for setting in result.scalars().all():
-        settings[setting.key] = setting.value
-    
     return PublicSettings(
-        system_title=settings.get("system_title", "TitanNVR Enterprise"),
-        theme_color=settings.get("theme_color", "#3B82F6"),
+        system_title=await settings_cache.get(db, "system_title", "TitanNVR Enterprise"),
+        theme_color=await settings_cache.get(db, "theme_color", "#3B82F6"),
         logo_url="/api/settings/logo" if LOGO_PATH.exists() else None,
-        company_name=settings.get("company_name", "Your Company")
+        company_name=await settings_cache.get(db, "company_name", "Your Company")
     )
 
 
@@ -198,6 +173,7 @@ async def upload_logo(
         db.add(setting)
     
     await db.commit()
+    settings_cache.invalidate()
     
     logger.info(f"Logo uploaded by {admin.username}")
     
@@ -222,6 +198,7 @@ async def delete_logo(
     if setting:
         setting.value = None
         await db.commit()
+        settings_cache.invalidate()
     
     logger.info(f"Logo deleted by {admin.username}")
     
@@ -238,17 +215,7 @@ async def list_settings(
     db: AsyncSession = Depends(get_db)
 ):
     """List all system settings (admin only)."""
-    result = await db.execute(select(SystemSettings).order_by(SystemSettings.key))
-    settings = result.scalars().all()
-    
-    return [
-        SettingResponse(
-            key=s.key,
-            value=s.value,
-            value_json=s.value_json,
-            description=s.description
-        ) for s in settings
-    ]
+    return [SettingResponse(**row) for row in await settings_cache.all(db)]
 
 
 @router.get("/{key}", response_model=SettingResponse)
@@ -258,20 +225,12 @@ async def get_setting(
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific setting by key (admin only)."""
-    result = await db.execute(
-        select(SystemSettings).where(SystemSettings.key == key)
-    )
-    setting = result.scalar_one_or_none()
+    row = await settings_cache.get_row(db, key)
     
-    if not setting:
+    if not row:
         raise HTTPException(status_code=404, detail="Setting not found")
     
-    return SettingResponse(
-        key=setting.key,
-        value=setting.value,
-        value_json=setting.value_json,
-        description=setting.description
-    )
+    return SettingResponse(**row)
 
 
 @router.put("/{key}", response_model=SettingResponse)
@@ -296,6 +255,7 @@ async def update_setting(
         setting.value_json = data.value_json
     
     await db.commit()
+    settings_cache.invalidate()
     await db.refresh(setting)
     
     logger.info(f"Setting '{key}' updated by {admin.username}")
@@ -325,6 +285,7 @@ async def update_smtp_config(
     
     setting.value_json = config.dict()
     await db.commit()
+    settings_cache.invalidate()
     await db.refresh(setting)
     
     logger.info(f"SMTP configuration updated by {admin.username}")
@@ -506,6 +467,7 @@ async def save_smtp_config(
         db.add(setting)
     
     await db.commit()
+    settings_cache.invalidate()
     
     logger.info(f"SMTP configuration saved by {admin.username}")
     
@@ -519,22 +481,35 @@ async def save_smtp_config(
 # Initialize Default Settings
 # ============================================================
 
+# Seed rows built once, sorted by key so concurrent workers seeding at the
+# same time insert (and lock) keys in the same order
+DEFAULT_SETTING_ROWS = sorted(
+    (
+        {
+            "key": default["key"],
+            "value": default.get("value"),
+            "value_json": default.get("value_json"),
+            "description": default.get("description"),
+        }
+        for default in DEFAULT_SETTINGS
+    ),
+    key=lambda row: row["key"]
+)
+
+
 async def init_default_settings(db: AsyncSession) -> None:
     """Initialize default settings if they don't exist."""
-    for default in DEFAULT_SETTINGS:
-        result = await db.execute(
-            select(SystemSettings).where(SystemSettings.key == default["key"])
-        )
-        existing = result.scalar_one_or_none()
-        
-        if not existing:
-            setting = SystemSettings(
-                key=default["key"],
-                value=default.get("value"),
-                value_json=default.get("value_json"),
-                description=default.get("description")
-            )
-            db.add(setting)
-            logger.info(f"Created default setting: {default['key']}")
+    # One batched INSERT ... ON CONFLICT DO NOTHING (executemany) - existing
+    # keys are skipped by the DB instead of checked one by one from Python.
+    # Timestamps come from the column server defaults
+    result = await db.execute(
+        dialect_insert(SystemSettings.__table__).on_conflict_do_nothing(index_elements=["key"]),
+        DEFAULT_SETTING_ROWS
+    )
+    
+    # Some drivers report -1 for executemany
+    if result.rowcount > 0:
+        logger.info(f"Created {result.rowcount} default setting(s)")
     
     await db.commit()
+    settings_cache.invalidate()
@@ -38,10 +38,11 @@ class AuditLogResponse(AuditLogBase):
 class AuditLogList(BaseModel):
     """Paginated list of audit logs."""
     items: List[AuditLogResponse]
-    total: int
+    total: Optional[int] = Field(None, description="Not computed when paging by cursor")
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = Field(None, description="Not computed when paging by cursor")
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page")
 
 
 class AuditLogFilter(BaseModel):
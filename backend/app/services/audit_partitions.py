@@ -0,0 +1,123 @@
+"""
+TitanNVR - Audit Log Partition Maintenance
+Monthly range partitions for audit_logs on PostgreSQL.
+
+Creates the partitions for the current and upcoming months ahead of time
+and drops those older than the configured retention, so cleanup is a
+metadata-only DROP TABLE instead of a DELETE scan. No-op on SQLite; warns
+and does nothing where audit_logs hasn't been converted yet (migration 0004).
+"""
+import asyncio
+import logging
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.database import engine, is_sqlite
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+PARTITION_NAME_RE = re.compile(rf"^{PARENT_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+
+def _add_months(month_start: date, months: int) -> date:
+    """Return the first day of the month `months` away from `month_start`."""
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(month_start: date) -> str:
+    return f"{PARENT_TABLE}_{month_start.year:04d}_{month_start.month:02d}"
+
+
+async def maintain_audit_partitions(months_ahead: int = 1) -> None:
+    """
+    Ensure monthly audit_logs partitions exist and drop expired ones.
+    
+    Args:
+        months_ahead: How many future months to pre-create besides the current one
+    """
+    if is_sqlite:
+        return
+    
+    this_month = date.today().replace(day=1)
+    
+    async with engine.begin() as conn:
+        is_partitioned = await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :name)"
+        ), {"name": PARENT_TABLE})
+        if not is_partitioned:
+            logger.warning(
+                f"⚠️ {PARENT_TABLE} is not partitioned - run 'alembic upgrade head' "
+                "to enable partition maintenance"
+            )
+            return
+        
+        # Catch-all for rows outside the pre-created range (e.g. clock skew)
+        await conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {PARENT_TABLE}_default "
+            f"PARTITION OF {PARENT_TABLE} DEFAULT"
+        ))
+        
+        for offset in range(months_ahead + 1):
+            start = _add_months(this_month, offset)
+            end = _add_months(start, 1)
+            await conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {_partition_name(start)} "
+                f"PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') "
+                f"TO ('{end.isoformat()} 00:00:00+00')"
+            ))
+        
+        if settings.audit_retention_months <= 0:
+            return
+        
+        cutoff = _add_months(this_month, -settings.audit_retention_months)
+        result = await conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name"
+        ), {"name": PARENT_TABLE})
+        
+        expired: List[str] = []
+        for (name,) in result:
+            match = PARTITION_NAME_RE.match(name)
+            if match and date(int(match.group(1)), int(match.group(2)), 1) < cutoff:
+                expired.append(name)
+        
+        for name in expired:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            logger.info(f"🗑️ Dropped expired audit partition: {name}")
+
+
+async def periodic_audit_partition_maintenance(interval_hours: int = 24):
+    """
+    Background task that keeps audit_logs partitions rolled over.
+    
+    Partitions are monthly and pre-created a month ahead, so a daily
+    check is plenty. The first run happens at startup (see main.py).
+    
+    Args:
+        interval_hours: Hours between maintenance runs (default: 24)
+    """
+    if is_sqlite:
+        return
+    
+    interval_seconds = interval_hours * 3600
+    
+    while True:
+        try:
+            await asyncio.sleep(interval_seconds)
+            await maintain_audit_partitions()
+        except asyncio.CancelledError:
+            logger.info("Audit partition maintenance task cancelled")
+            break
+        except Exception as e:
+            logger.error(f"Audit partition maintenance error: {e}")
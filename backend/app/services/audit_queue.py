@@ -0,0 +1,222 @@
+"""
+TitanNVR - Audit Log Write Queue
+Takes audit inserts off the request path.
+
+log_action enqueues plain row dicts; a background task started in the app
+lifespan drains the queue and writes each batch with a single executemany
+INSERT in its own session. The action timestamp is captured when the entry
+is queued, not when it is written. When the queue is nearly full, callers
+wait briefly for the writer to catch up before an entry is dropped.
+
+Entries don't join the caller's transaction: once queued they are written
+whether or not the request that logged them commits.
+
+Details can be queued as a template ID plus parameters (AuditDetails); the
+string is only built by the writer, right before the batch INSERT.
+"""
+import asyncio
+import logging
+from typing import Callable, Dict, List
+
+from sqlalchemy import insert
+
+from app.database import async_session_maker
+from app.models.audit import AuditLog, DETAILS_MAX_LENGTH
+
+logger = logging.getLogger(__name__)
+
+# Core INSERT built once; the compiled form is reused from the statement cache
+AUDIT_INSERT = insert(AuditLog.__table__)
+
+
+def _user_update_details(username: str, changes: List[str], password_reset: bool) -> str:
+    if password_reset:
+        details = f"Password reset for user '{username}'"
+        other_changes = [c for c in changes if c != "password_reset"]
+        if other_changes:
+            details += f" + other changes: {', '.join(other_changes)}"
+        return details
+    
+    details = f"Updated user '{username}'"
+    if changes:
+        details += f": {', '.join(changes)}"
+    return details
+
+
+def _user_permissions_details(username: str, camera_names: List[str]) -> str:
+    names = ", ".join(camera_names[:5])
+    if len(camera_names) > 5:
+        names += "..."
+    return f"Updated camera permissions for user '{username}': {len(camera_names)} cameras ({names})"
+
+
+# Deferred details formatters, by template ID
+AUDIT_DETAIL_TEMPLATES: Dict[str, Callable[..., str]] = {
+    "user_update": _user_update_details,
+    "user_permissions": _user_permissions_details,
+}
+
+
+class AuditDetails:
+    """Audit details kept as template ID + parameters until written."""
+    
+    __slots__ = ("template", "params")
+    
+    def __init__(self, template: str, params: dict):
+        if template not in AUDIT_DETAIL_TEMPLATES:
+            raise KeyError(f"Unknown audit details template: {template}")
+        self.template = template
+        self.params = params
+    
+    def render(self) -> str:
+        return AUDIT_DETAIL_TEMPLATES[self.template](**self.params)
+
+
+def render_entry(entry: dict) -> dict:
+    """Final audit row: details rendered and truncated, then logged."""
+    details = entry["details"]
+    if isinstance(details, AuditDetails):
+        try:
+            details = details.render()
+        except Exception as e:
+            # Never let a bad template stop the writer - keep the raw fields
+            logger.warning(f"⚠️ Audit details template '{details.template}' failed: {e}")
+            details = f"{details.template}: {details.params!r}"
+    if details:
+        details = details[:DETAILS_MAX_LENGTH]
+    
+    logger.info(f"[AUDIT] {entry['username']}: {entry['action']} - {details}")
+    return {**entry, "details": details}
+
+
+class AuditQueue:
+    """Buffered, batched writer for audit log rows."""
+    
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_size: int = 10000,
+        put_timeout: float = 0.5,
+        write_attempts: int = 3
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.write_attempts = write_attempts
+        self._high_water = int(max_size * 0.8)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+    
+    async def put(self, entry: dict) -> None:
+        """
+        Queue an audit row.
+        
+        Above 80% capacity the caller waits (up to `put_timeout`) for room,
+        slowing producers down; if the queue stays full the entry is dropped
+        with a warning.
+        """
+        if self._queue.qsize() < self._high_water:
+            self._queue.put_nowait(entry)
+            return
+        
+        try:
+            await asyncio.wait_for(self._queue.put(entry), self.put_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ Audit queue full, dropping entry: {entry.get('action')}")
+    
+    async def write_now(self, entry: dict) -> None:
+        """
+        Persist a single audit row immediately (critical-path audits).
+        
+        One attempt, no backoff - the caller is waiting on it. If it fails,
+        the error is logged and the row goes to the queue, where the
+        background writer retries it.
+        """
+        try:
+            await self._insert([render_entry(entry)])
+        except Exception as e:
+            logger.error(f"❌ Immediate audit write failed, queueing {entry.get('action')}: {e}")
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                logger.error(f"❌ Audit queue full, dropping entry: {entry.get('action')}")
+    
+    async def flush(self) -> None:
+        """Write everything currently queued."""
+        while not self._queue.empty():
+            await self._write(self._drain(self.batch_size))
+    
+    async def run(self) -> None:
+        """Background loop: wait for entries, batch them and write them."""
+        logger.info("📝 Audit queue writer started")
+        
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = []
+            try:
+                batch.append(await self._queue.get())
+                
+                # Give concurrent requests a moment to add to the same batch
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Shutting down - don't lose entries already taken off the queue
+                await self._write(batch)
+                raise
+            
+            await self._write(batch)
+    
+    def _drain(self, limit: int) -> List[dict]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+    
+    async def _insert(self, rows: List[dict]) -> None:
+        async with async_session_maker() as session:
+            await session.execute(AUDIT_INSERT, rows)
+            await session.commit()
+    
+    async def _write(self, batch: List[dict]) -> None:
+        if not batch:
+            return
+        
+        rows = [render_entry(entry) for entry in batch]
+        
+        # Retry transient failures (e.g. SQLite "database is locked" while a
+        # long request holds the write lock) before giving up on the batch
+        for attempt in range(1, self.write_attempts + 1):
+            try:
+                await self._insert(rows)
+                return
+            except Exception as e:
+                if attempt == self.write_attempts:
+                    logger.error(f"❌ Failed to write {len(batch)} audit entries: {e}")
+                    break
+                logger.warning(f"⚠️ Audit write failed (attempt {attempt}), retrying: {e}")
+                await asyncio.sleep(attempt)
+        
+        if len(batch) == 1:
+            return
+        
+        # Still failing - most likely one bad row (e.g. a user_id deleted in
+        # the meantime) rejecting the whole executemany. Write the rows one
+        # by one so only the bad ones are lost.
+        logger.warning(f"⚠️ Writing {len(batch)} audit entries one by one")
+        for row in rows:
+            try:
+                await self._insert([row])
+            except Exception as e:
+                logger.error(f"❌ Dropped audit entry {row.get('action')} by {row.get('username')}: {e}")
+
+
+# Singleton instance
+audit_queue = AuditQueue()
@@ -2,21 +2,27 @@
 TitanNVR - Authentication Service
 Enterprise JWT authentication and role-based access control
 """
+import asyncio
 import os
 import logging
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, exists
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_db, dialect_insert
 from app.models.user import User, UserRole
+from app.services.token_cache import token_cache
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 # Security configuration
@@ -24,8 +30,35 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "titan-nvr-enterprise-secret-key-change
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "480"))  # 8 hours default
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: Argon2id for new hashes. bcrypt is kept only to verify
+# legacy hashes, which (like Argon2 hashes with outdated cost parameters)
+# are flagged for rehash and upgraded on successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism
+)
+
+# Hash of a random password, verified against when the username doesn't exist
+# (or is inactive) so failed logins take the same time either way and
+# response timing doesn't reveal which usernames exist
+DUMMY_PASSWORD_HASH = pwd_context.hash(secrets.token_urlsafe(16))
+
+# Dedicated pool for password hashing. Argon2/bcrypt are CPU-bound but
+# release the GIL, so threads hash in parallel without blocking the event loop
+HASH_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1,
+    thread_name_prefix="password-hash"
+)
+
+
+async def run_in_hash_pool(func, *args):
+    """Run a blocking hash/verify call in HASH_POOL."""
+    return await asyncio.get_running_loop().run_in_executor(HASH_POOL, func, *args)
+
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
@@ -35,14 +68,25 @@ class AuthService:
     """Service for handling authentication operations."""
     
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash."""
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash (off the event loop)."""
+        return await run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+    
+    @staticmethod
+    async def verify_and_update_password(
+        plain_password: str,
+        hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, if its hash is outdated (bcrypt or old Argon2
+        parameters), return a fresh hash to store in its place.
+        """
+        return await run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
     
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        """Generate password hash."""
-        return pwd_context.hash(password)
+    async def get_password_hash(password: str) -> str:
+        """Generate password hash (off the event loop)."""
+        return await run_in_hash_pool(pwd_context.hash, password)
     
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -80,19 +124,28 @@ class AuthService:
         user = result.scalar_one_or_none()
         
         if not user:
+            await AuthService.verify_password(password, DUMMY_PASSWORD_HASH)
             logger.warning(f"Login attempt for non-existent user: {username}")
             return None
         
         if not user.is_active:
+            await AuthService.verify_password(password, DUMMY_PASSWORD_HASH)
             logger.warning(f"Login attempt for inactive user: {username}")
             return None
         
-        if not AuthService.verify_password(password, user.hashed_password):
+        valid, new_hash = await AuthService.verify_and_update_password(password, user.hashed_password)
+        if not valid:
             logger.warning(f"Invalid password for user: {username}")
             return None
         
+        # Transparently migrate legacy/outdated hashes (saved with last_login)
+        if new_hash:
+            user.hashed_password = new_hash
+            token_cache.invalidate_user(user.id)
+            logger.info(f"🔐 Password hash upgraded for user: {username}")
+        
         # Update last login
-        user.last_login = datetime.utcnow()
+        user.last_login = func.now()
         await db.commit()
         
         logger.info(f"User authenticated successfully: {username}")
@@ -100,33 +153,50 @@ class AuthService:
     
     @staticmethod
     async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
-        """Get user by ID."""
-        result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        return result.scalar_one_or_none()
+        """Get user by ID (identity map first, then a primary-key lookup)."""
+        return await db.get(User, user_id)
     
     @staticmethod
-    async def create_user(
+    async def create_user_if_not_exists(
         db: AsyncSession,
         username: str,
         password: str,
         email: Optional[str] = None,
         role: UserRole = UserRole.VIEWER
-    ) -> User:
-        """Create a new user."""
-        hashed_password = AuthService.get_password_hash(password)
+    ) -> Optional[User]:
+        """
+        Create a new user, or return None if the username is taken.
+        
+        A taken username is rejected by an index-only EXISTS check before
+        the (expensive) password hash is computed. The INSERT ... ON CONFLICT
+        (username) DO NOTHING RETURNING still settles races between the
+        check and the insert.
+        """
+        taken = await db.scalar(
+            select(exists().where(User.username == username))
+        )
+        if taken:
+            return None
+        
+        hashed_password = await AuthService.get_password_hash(password)
+        role = getattr(role, "value", role)
         
-        user = User(
-            username=username,
-            hashed_password=hashed_password,
-            email=email,
-            role=role
+        result = await db.execute(
+            dialect_insert(User)
+            .values(
+                username=username,
+                hashed_password=hashed_password,
+                email=email,
+                role=role
+            )
+            .on_conflict_do_nothing(index_elements=["username"])
+            .returning(User)
         )
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
         
-        db.add(user)
         await db.commit()
-        await db.refresh(user)
         
         logger.info(f"Created new user: {username} with role: {role}")
         return user
@@ -134,22 +204,40 @@ class AuthService:
 
 # Dependency functions for FastAPI
 async def get_current_user(
+    request: Request,
     token: Optional[str] = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
-    """Get current authenticated user from JWT token."""
+    """
+    Get current authenticated user from JWT token.
+    
+    Repeat requests with the same token are served from the token cache
+    (no JWT decode, no users SELECT). The resolved user is kept on
+    request.state.current_user, so a second resolution in the same request
+    (or code outside the dependency graph) reuses it.
+    """
     if not token:
         return None
     
-    payload = AuthService.decode_token(token)
-    if not payload:
-        return None
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
     
-    user_id = payload.get("sub")
-    if not user_id:
-        return None
+    user = await token_cache.get_user(db, token)
+    if user is None:
+        payload = AuthService.decode_token(token)
+        if not payload:
+            return None
+        
+        user_id = payload.get("sub")
+        if not user_id:
+            return None
+        
+        user = await AuthService.get_user_by_id(db, int(user_id))
+        if user:
+            token_cache.put(token, user, payload.get("exp"))
     
-    user = await AuthService.get_user_by_id(db, int(user_id))
+    request.state.current_user = user
     return user
 
 
@@ -202,7 +290,7 @@ async def create_default_admin(db: AsyncSession) -> None:
     
     admin = User(
         username="admin",
-        hashed_password=AuthService.get_password_hash("admin123"),
+        hashed_password=await AuthService.get_password_hash("admin123"),
         email="admin@titannvr.local",
         role=UserRole.ADMIN,
         is_active=True
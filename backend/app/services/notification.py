@@ -15,7 +15,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from app.models.user import User, UserRole
-from app.models.settings import SystemSettings
+from app.services.settings_cache import settings_cache
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +37,10 @@ class NotificationService:
     async def load_config(self, db: AsyncSession) -> bool:
         """Load SMTP configuration from database."""
         try:
-            result = await db.execute(
-                select(SystemSettings).where(SystemSettings.key == "smtp_config")
-            )
-            setting = result.scalar_one_or_none()
+            smtp_config = await settings_cache.get_json(db, "smtp_config")
             
-            if setting and setting.value_json:
-                self.smtp_config = setting.value_json
+            if smtp_config:
+                self.smtp_config = smtp_config
                 self._initialized = self.smtp_config.get("enabled", False)
                 logger.info(f"SMTP config loaded, enabled: {self._initialized}")
                 return self._initialized
@@ -59,7 +56,7 @@ class NotificationService:
         """Get email addresses of all admin users with alerts enabled."""
         result = await db.execute(
             select(User).where(
-                User.role == UserRole.ADMIN,
+                User.role == UserRole.ADMIN.value,
                 User.is_active == True,
                 User.receive_email_alerts == True,
                 User.email.isnot(None)
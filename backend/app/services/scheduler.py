@@ -4,17 +4,28 @@ Applies time-based recording modes to cameras.
 """
 import asyncio
 import logging
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import select, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import selectinload
 
-from app.database import async_session_maker
+from app.config import get_settings
+from app.database import async_session_maker, is_sqlite
 from app.models.camera import Camera, CameraSchedule, RecordingMode
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# PostgreSQL NOTIFY channel fired by the cameras/camera_schedules triggers
+# (installed by migration 0005)
+SCHEDULE_CHANGED_CHANNEL = "camera_schedule_changed"
+
+# Transaction-local setting the triggers check to skip notifying, so the
+# scheduler's own recording_mode updates don't wake it right back up
+SCHEDULER_WRITE_SETTING = "titannvr.scheduler_write"
+
 
 class SchedulerService:
     """
@@ -27,11 +38,33 @@ class SchedulerService:
     def __init__(self):
         self._running = False
         self._sync_callback = None
+        self._wake_event = asyncio.Event()
+        self._next_boundary: Optional[datetime] = None
     
     def set_sync_callback(self, callback):
         """Set the callback to sync cameras to Frigate."""
         self._sync_callback = callback
     
+    def wake(self):
+        """Request an immediate schedule check (cameras or schedules changed)."""
+        self._wake_event.set()
+    
+    async def wait_for_next_check(self, max_wait_seconds: float):
+        """
+        Sleep until the next schedule slot boundary, a change notification,
+        or `max_wait_seconds` (keepalive for changes made outside this process).
+        """
+        timeout = max_wait_seconds
+        if self._next_boundary is not None:
+            until_boundary = (self._next_boundary - datetime.now()).total_seconds()
+            timeout = min(timeout, max(until_boundary, 1.0))
+        
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wake_event.clear()
+    
     async def check_and_apply_schedules(self) -> int:
         """
         Check all cameras with schedules and apply the correct recording mode.
@@ -44,6 +77,7 @@ class SchedulerService:
         
         updated_count = 0
         cameras_to_sync = []
+        next_boundary: Optional[datetime] = None
         
         try:
             async with async_session_maker() as session:
@@ -59,6 +93,10 @@ class SchedulerService:
                     if not camera.schedules:
                         continue
                     
+                    boundary = self._find_next_boundary(camera.schedules, now)
+                    if next_boundary is None or boundary < next_boundary:
+                        next_boundary = boundary
+                    
                     # Find applicable schedule for current time
                     applicable_mode = self._find_applicable_mode(
                         camera.schedules, 
@@ -79,13 +117,17 @@ class SchedulerService:
                         
                         logger.info(
                             f"📅 Schedule: Camera '{camera.name}' mode changed: "
-                            f"{old_mode.value} → {applicable_mode.value}"
+                            f"{old_mode} → {applicable_mode.value}"
                         )
                 
                 # Commit all changes
                 if updated_count > 0:
+                    if not is_sqlite:
+                        await session.execute(text(f"SET LOCAL {SCHEDULER_WRITE_SETTING} = 'on'"))
                     await session.commit()
                     logger.info(f"📅 Scheduler: Updated {updated_count} camera(s)")
+            
+            self._next_boundary = next_boundary
                     
         except Exception as e:
             logger.error(f"Scheduler error: {e}")
@@ -133,15 +175,68 @@ class SchedulerService:
         
         return None
     
-    async def run(self, interval_seconds: int = 60):
+    def _find_next_boundary(self, schedules: list, now: datetime) -> datetime:
+        """
+        Find the next moment the applicable mode for these schedules can change.
+        
+        That is the next slot start, the second after the next slot end
+        (ends are inclusive), or the next midnight (weekday rollover).
+        """
+        today = now.date()
+        candidates = [datetime.combine(today + timedelta(days=1), time.min)]
+        
+        for schedule in schedules:
+            days_ahead = (schedule.day_of_week - today.weekday()) % 7
+            for offset in (days_ahead, days_ahead + 7):
+                day = today + timedelta(days=offset)
+                candidates.append(datetime.combine(day, schedule.start_time))
+                candidates.append(datetime.combine(day, schedule.end_time) + timedelta(seconds=1))
+        
+        return min(c for c in candidates if c > now)
+    
+    async def listen_for_changes(self, retry_seconds: int = 30):
+        """
+        Wake the scheduler on PostgreSQL NOTIFY instead of waiting for a poll.
+        
+        Holds a dedicated asyncpg connection (outside the pool) with LISTEN
+        on SCHEDULE_CHANGED_CHANNEL, reconnecting if it drops. Only listens -
+        the triggers come from migrations, so this needs no DDL privileges.
+        """
+        import asyncpg
+        
+        dsn = make_url(settings.database_url).set(drivername="postgresql")
+        
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+                try:
+                    closed = asyncio.Event()
+                    conn.add_termination_listener(lambda _conn: closed.set())
+                    await conn.add_listener(
+                        SCHEDULE_CHANGED_CHANNEL,
+                        lambda *_args: self.wake()
+                    )
+                    logger.info(f"📅 Scheduler listening for '{SCHEDULE_CHANGED_CHANNEL}' notifications")
+                    await closed.wait()
+                finally:
+                    await conn.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Scheduler change listener error: {e}")
+            
+            await asyncio.sleep(retry_seconds)
+    
+    async def run(self, interval_seconds: int = 600):
         """
         Run the scheduler loop.
         
         Args:
-            interval_seconds: How often to check schedules (default: 60 seconds)
+            interval_seconds: Longest wait between checks when no slot boundary
+                or change notification comes first (default: 10 minutes)
         """
         self._running = True
-        logger.info(f"📅 Scheduler started (checking every {interval_seconds}s)")
+        logger.info(f"📅 Scheduler started (keepalive every {interval_seconds}s)")
         
         while self._running:
             try:
@@ -149,7 +244,7 @@ class SchedulerService:
             except Exception as e:
                 logger.error(f"Scheduler loop error: {e}")
             
-            await asyncio.sleep(interval_seconds)
+            await self.wait_for_next_check(interval_seconds)
     
     def stop(self):
         """Stop the scheduler loop."""
@@ -161,7 +256,7 @@ class SchedulerService:
 scheduler_service = SchedulerService()
 
 
-async def run_scheduler(interval_seconds: int = 60):
+async def run_scheduler(interval_seconds: int = 600):
     """
     Convenience function to run the scheduler.
     Called from main.py as a background task.
@@ -169,21 +264,33 @@ async def run_scheduler(interval_seconds: int = 60):
     await scheduler_service.run(interval_seconds)
 
 
-async def periodic_schedule_check(interval_seconds: int = 60):
+async def periodic_schedule_check(interval_seconds: int = 600):
     """
     Alternative periodic scheduler that integrates with existing patterns.
-    Runs indefinitely, checking schedules at the specified interval.
+    
+    Instead of polling at a fixed rate, each check sleeps until the next
+    schedule slot boundary or until woken by a change (PostgreSQL NOTIFY
+    or an in-process `scheduler_service.wake()`), with `interval_seconds`
+    as the keepalive ceiling.
     """
     from app.routers.cameras import sync_all_to_frigate
     
     scheduler_service.set_sync_callback(sync_all_to_frigate)
     
-    logger.info(f"📅 Recording Scheduler started (interval: {interval_seconds}s)")
+    logger.info(f"📅 Recording Scheduler started (keepalive: {interval_seconds}s)")
     
-    while True:
-        try:
-            await scheduler_service.check_and_apply_schedules()
-        except Exception as e:
-            logger.error(f"Periodic schedule check error: {e}")
-        
-        await asyncio.sleep(interval_seconds)
+    listener_task = None
+    if not is_sqlite:
+        listener_task = asyncio.create_task(scheduler_service.listen_for_changes())
+    
+    try:
+        while True:
+            try:
+                await scheduler_service.check_and_apply_schedules()
+            except Exception as e:
+                logger.error(f"Periodic schedule check error: {e}")
+            
+            await scheduler_service.wait_for_next_check(interval_seconds)
+    finally:
+        if listener_task:
+            listener_task.cancel()
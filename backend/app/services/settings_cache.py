@@ -0,0 +1,86 @@
+"""
+TitanNVR - System Settings Cache
+In-process cache for the system_settings key-value table.
+
+Settings are read on many requests (branding on every page load, SMTP on
+every notification) but only written by admins. The whole table is loaded
+with a single SELECT and served from a dict; writers call `invalidate()`
+after committing so this worker reloads on the next read. Rows changed by
+other workers are picked up when the cache expires (`max_age` seconds).
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.settings import SystemSettings
+
+
+class SettingsCache:
+    """Process-wide snapshot of system_settings rows, keyed by setting key."""
+    
+    def __init__(self, max_age: float = 5.0):
+        self.max_age = max_age
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+    
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.max_age
+        )
+    
+    async def load(self, db: AsyncSession) -> None:
+        """Reload every setting in one SELECT."""
+        result = await db.execute(
+            select(
+                SystemSettings.key,
+                SystemSettings.value,
+                SystemSettings.value_json,
+                SystemSettings.description
+            )
+        )
+        self._rows = {row.key: row._asdict() for row in result}
+        self._loaded_at = time.monotonic()
+    
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        
+        # Concurrent readers of a stale cache share a single reload
+        async with self._lock:
+            if not self._is_fresh():
+                await self.load(db)
+    
+    def invalidate(self) -> None:
+        """Drop the snapshot - call after committing a settings write."""
+        self._loaded_at = None
+    
+    async def get_row(self, db: AsyncSession, key: str) -> Optional[Dict[str, Any]]:
+        """Get a setting row (key, value, value_json, description) or None."""
+        await self._ensure_loaded(db)
+        return self._rows.get(key)
+    
+    async def get(self, db: AsyncSession, key: str, default: Any = None) -> Any:
+        """Get a setting's text value."""
+        row = await self.get_row(db, key)
+        if row is None or row["value"] is None:
+            return default
+        return row["value"]
+    
+    async def get_json(self, db: AsyncSession, key: str) -> Optional[Dict[str, Any]]:
+        """Get a setting's JSON value."""
+        row = await self.get_row(db, key)
+        return row["value_json"] if row else None
+    
+    async def all(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        """Get all setting rows, ordered by key."""
+        await self._ensure_loaded(db)
+        return [self._rows[key] for key in sorted(self._rows)]
+
+
+# Singleton instance
+settings_cache = SettingsCache()
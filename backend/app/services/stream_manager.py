@@ -9,12 +9,16 @@ import asyncio
 import httpx
 import logging
 import yaml
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.config import get_settings
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Connection pool of the shared Go2RTC HTTP client
+GO2RTC_MAX_CONNECTIONS = 64
+GO2RTC_MAX_KEEPALIVE = 32
+
 
 class StreamManager:
     """
@@ -32,6 +36,35 @@ class StreamManager:
     def __init__(self, go2rtc_url: str = None):
         self.go2rtc_url = go2rtc_url or settings.go2rtc_url
         self.timeout = 10.0
+        # Serializes read-modify-write of the Go2RTC config file so that
+        # concurrent registrations don't overwrite each other's streams
+        self._config_lock = asyncio.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client for all Go2RTC calls.
+        
+        Keeps connections alive between requests, so registering or checking
+        many cameras reuses a few sockets instead of opening one per call.
+        Created on first use; closed by close() at shutdown.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=GO2RTC_MAX_CONNECTIONS,
+                    max_keepalive_connections=GO2RTC_MAX_KEEPALIVE
+                )
+            )
+        return self._client
+    
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     def _normalize_name(self, name: str) -> str:
         """
@@ -174,11 +207,10 @@ class StreamManager:
     
     async def _get_config(self) -> Dict[str, Any]:
         """Get current Go2RTC configuration as dict."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(f"{self.go2rtc_url}/api/config")
-            if response.status_code == 200:
-                return yaml.safe_load(response.text)
-            return {}
+        response = await self.client.get(f"{self.go2rtc_url}/api/config")
+        if response.status_code == 200:
+            return yaml.safe_load(response.text)
+        return {}
     
     async def _patch_config(self, config_update: Dict[str, Any]) -> bool:
         """
@@ -188,14 +220,13 @@ class StreamManager:
         yaml_content = yaml.dump(config_update, default_flow_style=False)
         logger.info(f"Patching Go2RTC config with:\n{yaml_content}")
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.patch(
-                f"{self.go2rtc_url}/api/config",
-                content=yaml_content,
-                headers={"Content-Type": "text/yaml"}
-            )
-            logger.info(f"PATCH response: {response.status_code}")
-            return response.status_code == 200
+        response = await self.client.patch(
+            f"{self.go2rtc_url}/api/config",
+            content=yaml_content,
+            headers={"Content-Type": "text/yaml"}
+        )
+        logger.info(f"PATCH response: {response.status_code}")
+        return response.status_code == 200
     
     async def _add_stream_via_api(self, stream_id: str, url: str, retries: int = 3) -> bool:
         """
@@ -211,32 +242,32 @@ class StreamManager:
         """
         for attempt in range(retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    # Go2RTC PUT /api/streams - immediate hot-reload
-                    response = await client.put(
-                        f"{self.go2rtc_url}/api/streams",
-                        params={"src": stream_id, "url": url}
-                    )
-                    logger.info(f"PUT /api/streams {stream_id}: status={response.status_code} (attempt {attempt + 1})")
-                    
-                    if response.status_code in [200, 201]:
-                        # Verify stream was added by checking streams list
-                        await asyncio.sleep(0.5)  # Brief delay for Go2RTC to process
-                        verify_response = await client.get(f"{self.go2rtc_url}/api/streams")
-                        if verify_response.status_code == 200:
-                            streams = verify_response.json()
-                            if stream_id in streams:
-                                logger.info(f"Stream {stream_id} verified active")
-                                return True
-                        return True  # Trust the 200 even if verify fails
+                client = self.client
+                # Go2RTC PUT /api/streams - immediate hot-reload
+                response = await client.put(
+                    f"{self.go2rtc_url}/api/streams",
+                    params={"src": stream_id, "url": url}
+                )
+                logger.info(f"PUT /api/streams {stream_id}: status={response.status_code} (attempt {attempt + 1})")
+                
+                if response.status_code in [200, 201]:
+                    # Verify stream was added by checking streams list
+                    await asyncio.sleep(0.5)  # Brief delay for Go2RTC to process
+                    verify_response = await client.get(f"{self.go2rtc_url}/api/streams")
+                    if verify_response.status_code == 200:
+                        streams = verify_response.json()
+                        if stream_id in streams:
+                            logger.info(f"Stream {stream_id} verified active")
+                            return True
+                    return True  # Trust the 200 even if verify fails
+                
+                # Retry on server errors
+                if response.status_code >= 500 and attempt < retries - 1:
+                    logger.warning(f"Server error, retrying... ({attempt + 1}/{retries})")
+                    await asyncio.sleep(1)
+                    continue
                     
-                    # Retry on server errors
-                    if response.status_code >= 500 and attempt < retries - 1:
-                        logger.warning(f"Server error, retrying... ({attempt + 1}/{retries})")
-                        await asyncio.sleep(1)
-                        continue
-                        
-                    return False
+                return False
                     
             except httpx.TimeoutException:
                 logger.warning(f"Timeout adding stream {stream_id}, attempt {attempt + 1}/{retries}")
@@ -256,13 +287,12 @@ class StreamManager:
         Uses DELETE /api/streams?src={name} for immediate deactivation.
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.delete(
-                    f"{self.go2rtc_url}/api/streams",
-                    params={"src": stream_id}
-                )
-                logger.info(f"DELETE /api/streams {stream_id}: status={response.status_code}")
-                return response.status_code in [200, 204]
+            response = await self.client.delete(
+                f"{self.go2rtc_url}/api/streams",
+                params={"src": stream_id}
+            )
+            logger.info(f"DELETE /api/streams {stream_id}: status={response.status_code}")
+            return response.status_code in [200, 204]
         except Exception as e:
             logger.error(f"Error removing stream via API {stream_id}: {e}")
             return False
@@ -273,10 +303,11 @@ class StreamManager:
         This ensures streams survive Go2RTC container restarts.
         """
         try:
-            current_config = await self._get_config()
-            current_streams = current_config.get("streams", {})
-            current_streams[stream_id] = url
-            return await self._patch_config({"streams": current_streams})
+            async with self._config_lock:
+                current_config = await self._get_config()
+                current_streams = current_config.get("streams", {})
+                current_streams[stream_id] = url
+                return await self._patch_config({"streams": current_streams})
         except Exception as e:
             logger.warning(f"Failed to persist stream config {stream_id}: {e}")
             return False
@@ -392,11 +423,12 @@ class StreamManager:
             
             # Also remove from config file for persistence
             try:
-                current_config = await self._get_config()
-                current_streams = current_config.get("streams", {})
-                current_streams.pop(main_stream_id, None)
-                current_streams.pop(sub_stream_id, None)
-                await self._patch_config({"streams": current_streams})
+                async with self._config_lock:
+                    current_config = await self._get_config()
+                    current_streams = current_config.get("streams", {})
+                    current_streams.pop(main_stream_id, None)
+                    current_streams.pop(sub_stream_id, None)
+                    await self._patch_config({"streams": current_streams})
             except Exception as config_err:
                 logger.warning(f"Config cleanup failed: {config_err}")
             
@@ -420,14 +452,13 @@ class StreamManager:
         Returns:
             dict with all streams or error
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(f"{self.go2rtc_url}/api/streams")
-                if response.status_code == 200:
-                    return {"status": "ok", "streams": response.json()}
-                return {"status": "error", "status_code": response.status_code}
-            except httpx.RequestError as e:
-                return {"status": "error", "error": str(e)}
+        try:
+            response = await self.client.get(f"{self.go2rtc_url}/api/streams")
+            if response.status_code == 200:
+                return {"status": "ok", "streams": response.json()}
+            return {"status": "error", "status_code": response.status_code}
+        except httpx.RequestError as e:
+            return {"status": "error", "error": str(e)}
     
     async def check_connection(self) -> bool:
         """
@@ -436,12 +467,34 @@ class StreamManager:
         Returns:
             True if connected, False otherwise
         """
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            try:
-                response = await client.get(f"{self.go2rtc_url}/api")
-                return response.status_code == 200
-            except httpx.RequestError:
-                return False
+        try:
+            response = await self.client.get(f"{self.go2rtc_url}/api", timeout=5.0)
+            return response.status_code == 200
+        except httpx.RequestError:
+            return False
+    
+    def _stream_status(self, streams: dict, name: str) -> dict:
+        """Status of a camera's sub stream (used for display) in a Go2RTC streams listing."""
+        stream_id = f"{self._normalize_name(name)}_sub"
+        
+        if stream_id not in streams:
+            return {"status": "offline", "details": "Stream not registered"}
+        
+        stream_info = streams[stream_id]
+        producers = stream_info.get("producers", [])
+        
+        # Check if any producer is active
+        if not producers:
+            return {"status": "offline", "details": "No producers"}
+        
+        # Check producer status - if it has recv bytes, it's receiving data
+        for producer in producers:
+            recv = producer.get("recv", 0)
+            if recv > 0:
+                return {"status": "online", "details": f"Receiving data: {recv} bytes"}
+        
+        # Producers exist but no data yet - might be connecting
+        return {"status": "connecting", "details": "Waiting for data"}
     
     async def check_stream_status(self, name: str) -> dict:
         """
@@ -455,40 +508,34 @@ class StreamManager:
         Returns:
             dict with status: "online", "offline", or "unknown"
         """
-        normalized_name = self._normalize_name(name)
-        stream_id = f"{normalized_name}_sub"  # Check sub stream (used for display)
+        return (await self.check_streams_status([name]))[name]
+    
+    async def check_streams_status(self, names: List[str]) -> Dict[str, dict]:
+        """
+        Check the status of many camera streams with a single Go2RTC request.
+        
+        /api/streams lists every stream, so one fetch answers for all cameras.
         
+        Args:
+            names: Camera names
+            
+        Returns:
+            dict mapping each camera name to its status dict (see check_stream_status)
+        """
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.go2rtc_url}/api/streams")
-                
-                if response.status_code != 200:
-                    return {"status": "unknown", "details": "Go2RTC not responding"}
-                
-                streams = response.json()
-                
-                if stream_id not in streams:
-                    return {"status": "offline", "details": "Stream not registered"}
-                
-                stream_info = streams[stream_id]
-                producers = stream_info.get("producers", [])
-                
-                # Check if any producer is active
-                if not producers:
-                    return {"status": "offline", "details": "No producers"}
-                
-                # Check producer status - if it has recv bytes, it's receiving data
-                for producer in producers:
-                    recv = producer.get("recv", 0)
-                    if recv > 0:
-                        return {"status": "online", "details": f"Receiving data: {recv} bytes"}
-                
-                # Producers exist but no data yet - might be connecting
-                return {"status": "connecting", "details": "Waiting for data"}
+            response = await self.client.get(f"{self.go2rtc_url}/api/streams", timeout=5.0)
+            
+            if response.status_code != 200:
+                unknown = {"status": "unknown", "details": "Go2RTC not responding"}
+                return {name: unknown for name in names}
+            
+            streams = response.json()
+            return {name: self._stream_status(streams, name) for name in names}
                 
         except httpx.RequestError as e:
             logger.error(f"Error checking stream status: {e}")
-            return {"status": "unknown", "details": str(e)}
+            unknown = {"status": "unknown", "details": str(e)}
+            return {name: unknown for name in names}
     
     def get_stream_urls(self, name: str) -> dict:
         """
@@ -543,12 +590,13 @@ class StreamManager:
         
         try:
             # Step 1: Get current config and add temp stream
-            current_config = await self._get_config()
-            current_streams = current_config.get("streams", {})
-            current_streams[temp_id] = stream_url
-            
-            # Register temp stream
-            success = await self._patch_config({"streams": current_streams})
+            async with self._config_lock:
+                current_config = await self._get_config()
+                current_streams = current_config.get("streams", {})
+                current_streams[temp_id] = stream_url
+                
+                # Register temp stream
+                success = await self._patch_config({"streams": current_streams})
             if not success:
                 return {
                     "success": False,
@@ -560,56 +608,55 @@ class StreamManager:
             await asyncio.sleep(timeout_seconds)
             
             # Step 3: Check stream status
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.go2rtc_url}/api/streams")
-                
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "error": "Go2RTC not responding",
-                        "details": f"Status code: {response.status_code}"
-                    }
-                
-                streams = response.json()
-                
-                if temp_id not in streams:
-                    return {
-                        "success": False,
-                        "error": "Stream not found after registration",
-                        "details": "Go2RTC may need restart"
-                    }
-                
-                stream_info = streams[temp_id]
-                producers = stream_info.get("producers", [])
-                
-                # Analyze producers
-                if not producers:
-                    return {
-                        "success": False,
-                        "error": "No se pudo conectar al stream",
-                        "details": "No producers found - URL may be incorrect or unreachable"
-                    }
-                
-                # Check if any producer has errors or is receiving data
-                for producer in producers:
-                    recv_bytes = producer.get("recv", 0)
-                    send_bytes = producer.get("send", 0)
-                    
-                    # If receiving data, connection is good
-                    if recv_bytes > 0:
-                        logger.info(f"Test successful: {temp_id} receiving {recv_bytes} bytes")
-                        return {
-                            "success": True,
-                            "details": f"Conexión exitosa - Recibiendo datos ({recv_bytes} bytes)",
-                            "recv_bytes": recv_bytes
-                        }
-                
-                # Producers exist but no data yet - might be auth issue or slow stream
+            response = await self.client.get(f"{self.go2rtc_url}/api/streams", timeout=5.0)
+            
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "error": "Go2RTC not responding",
+                    "details": f"Status code: {response.status_code}"
+                }
+            
+            streams = response.json()
+            
+            if temp_id not in streams:
+                return {
+                    "success": False,
+                    "error": "Stream not found after registration",
+                    "details": "Go2RTC may need restart"
+                }
+            
+            stream_info = streams[temp_id]
+            producers = stream_info.get("producers", [])
+            
+            # Analyze producers
+            if not producers:
                 return {
                     "success": False,
-                    "error": "Stream conectado pero sin datos",
-                    "details": "Posible problema de autenticación o stream inactivo"
+                    "error": "No se pudo conectar al stream",
+                    "details": "No producers found - URL may be incorrect or unreachable"
                 }
+            
+            # Check if any producer has errors or is receiving data
+            for producer in producers:
+                recv_bytes = producer.get("recv", 0)
+                send_bytes = producer.get("send", 0)
+                
+                # If receiving data, connection is good
+                if recv_bytes > 0:
+                    logger.info(f"Test successful: {temp_id} receiving {recv_bytes} bytes")
+                    return {
+                        "success": True,
+                        "details": f"Conexión exitosa - Recibiendo datos ({recv_bytes} bytes)",
+                        "recv_bytes": recv_bytes
+                    }
+            
+            # Producers exist but no data yet - might be auth issue or slow stream
+            return {
+                "success": False,
+                "error": "Stream conectado pero sin datos",
+                "details": "Posible problema de autenticación o stream inactivo"
+            }
                 
         except httpx.TimeoutException:
             return {
@@ -633,12 +680,13 @@ class StreamManager:
         finally:
             # Step 4: ALWAYS clean up - remove temp stream
             try:
-                current_config = await self._get_config()
-                current_streams = current_config.get("streams", {})
-                if temp_id in current_streams:
-                    del current_streams[temp_id]
-                    await self._patch_config({"streams": current_streams})
-                    logger.info(f"Cleaned up temp stream: {temp_id}")
+                async with self._config_lock:
+                    current_config = await self._get_config()
+                    current_streams = current_config.get("streams", {})
+                    if temp_id in current_streams:
+                        del current_streams[temp_id]
+                        await self._patch_config({"streams": current_streams})
+                        logger.info(f"Cleaned up temp stream: {temp_id}")
             except Exception as cleanup_error:
                 logger.error(f"Failed to cleanup temp stream {temp_id}: {cleanup_error}")
 
@@ -0,0 +1,104 @@
+"""
+TitanNVR - Access Token Cache
+Skips the JWT decode and the users SELECT on repeat requests with the same token.
+
+Entries are keyed by SHA-256 of the bearer token (raw tokens are never kept)
+and hold the user's column values, from which a session-bound User is
+rebuilt without a query. TTL is capped at the token's own expiry. Entries
+are dropped on logout, password change and user update/delete; changes made
+by another worker are picked up when the entry expires.
+"""
+import hashlib
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.models.user import User
+
+# Column attributes restored on a cache hit
+USER_COLUMNS = tuple(column.key for column in inspect(User).column_attrs)
+
+
+def token_key(token: str) -> bytes:
+    """Cache key for a bearer token."""
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """In-process TTL cache of authenticated users, keyed by token hash."""
+    
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[bytes, Tuple[float, Dict[str, Any]]] = {}
+    
+    async def get_user(self, db: AsyncSession, token: str) -> Optional[User]:
+        """Return the cached user attached to `db`, or None on a miss."""
+        key = token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, values = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        
+        # Same identity already loaded in this session - use it as is
+        existing = db.identity_map.get(inspect(User).identity_key_from_primary_key((values["id"],)))
+        if existing is not None:
+            return existing
+        
+        # Rebuild as a persistent instance without a SELECT
+        user = User(**values)
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+    
+    def put(self, token: str, user: User, token_exp: Optional[float] = None) -> None:
+        """Cache a user for this token (never past the token's `exp`)."""
+        state = inspect(user)
+        if any(name in state.unloaded for name in USER_COLUMNS):
+            # e.g. last_login just set to a SQL expression - load it next time
+            return
+        
+        ttl = self.ttl
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+        
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+        
+        values = {name: getattr(user, name) for name in USER_COLUMNS}
+        self._entries[token_key(token)] = (time.monotonic() + ttl, values)
+    
+    def invalidate_token(self, token: str) -> None:
+        """Drop the entry for one token (logout)."""
+        self._entries.pop(token_key(token), None)
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every entry for a user (password/role/status change, deletion)."""
+        for key in [k for k, (_, values) in self._entries.items() if values["id"] == user_id]:
+            del self._entries[key]
+    
+    def clear(self) -> None:
+        """Drop all entries (bulk user changes, e.g. backup import)."""
+        self._entries.clear()
+    
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        
+        # Still full: drop the oldest insertions
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+
+# Singleton instance
+token_cache = TokenCache()
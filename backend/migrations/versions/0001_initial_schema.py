@@ -0,0 +1,212 @@
+"""Initial schema
+
+Frozen snapshot of the schema the models produced before migrations were
+introduced (when tables came from create_all at startup). Later model
+changes each have their own revision - never edit this one to follow the
+models.
+
+Databases bootstrapped by that create_all already have these tables; any
+table that exists is left as is, so upgrading such a database simply
+adopts it and the later revisions bring it up to date.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Enum member *names*, as SQLAlchemy Enum columns stored them at the time
+USER_ROLES = ("ADMIN", "OPERATOR", "VIEWER")
+RECORDING_MODES = ("CONTINUOUS", "MOTION", "EVENTS", "NONE")
+
+
+def _create_events() -> None:
+    op.create_table(
+        "events",
+        sa.Column("id", sa.String(length=64), nullable=False),
+        sa.Column("camera", sa.String(length=255), nullable=False),
+        sa.Column("label", sa.String(length=100), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("has_clip", sa.Boolean(), nullable=False),
+        sa.Column("has_snapshot", sa.Boolean(), nullable=False),
+        sa.Column("thumbnail_path", sa.String(length=500), nullable=True),
+        sa.Column("zones", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_events_camera", "events", ["camera"])
+    op.create_index("ix_events_camera_start", "events", ["camera", "start_time"])
+    op.create_index("ix_events_label", "events", ["label"])
+    op.create_index("ix_events_label_start", "events", ["label", "start_time"])
+    op.create_index("ix_events_start_time", "events", ["start_time"])
+
+
+def _create_maps() -> None:
+    op.create_table(
+        "maps",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("image_path", sa.String(length=500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def _create_system_settings() -> None:
+    op.create_table(
+        "system_settings",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=100), nullable=False),
+        sa.Column("value", sa.Text(), nullable=True),
+        sa.Column("value_json", sa.JSON(), nullable=True),
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_system_settings_id", "system_settings", ["id"])
+    op.create_index("ix_system_settings_key", "system_settings", ["key"], unique=True)
+
+
+def _create_users() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("role", sa.Enum(*USER_ROLES, name="userrole"), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("receive_email_alerts", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("last_login", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("email"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+
+def _create_audit_logs() -> None:
+    op.create_table(
+        "audit_logs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("username", sa.String(length=100), nullable=False),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("details", sa.Text(), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.String(length=500), nullable=True),
+        sa.Column("resource_type", sa.String(length=50), nullable=True),
+        sa.Column("resource_id", sa.String(length=100), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_audit_action_timestamp", "audit_logs", ["action", "timestamp"])
+    op.create_index("ix_audit_logs_action", "audit_logs", ["action"])
+    op.create_index("ix_audit_logs_resource_type", "audit_logs", ["resource_type"])
+    op.create_index("ix_audit_logs_timestamp", "audit_logs", ["timestamp"])
+    op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"])
+    op.create_index("ix_audit_logs_username", "audit_logs", ["username"])
+    op.create_index("ix_audit_user_timestamp", "audit_logs", ["user_id", "timestamp"])
+
+
+def _create_cameras() -> None:
+    op.create_table(
+        "cameras",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("main_stream_url", sa.String(length=500), nullable=False),
+        sa.Column("sub_stream_url", sa.String(length=500), nullable=True),
+        sa.Column("is_recording", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("group", sa.String(length=100), nullable=True),
+        sa.Column("retention_days", sa.Integer(), nullable=False),
+        sa.Column("recording_mode", sa.Enum(*RECORDING_MODES, name="recordingmode"), nullable=False),
+        sa.Column("zones_config", sa.JSON(), nullable=True),
+        sa.Column("event_retention_days", sa.Integer(), nullable=False),
+        sa.Column("map_id", sa.Integer(), nullable=True),
+        sa.Column("map_x", sa.Float(), nullable=True),
+        sa.Column("map_y", sa.Float(), nullable=True),
+        sa.Column("features_ptz", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["map_id"], ["maps.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def _create_camera_schedules() -> None:
+    op.create_table(
+        "camera_schedules",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("camera_id", sa.Integer(), nullable=False),
+        sa.Column("day_of_week", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+        # The recordingmode type is created with the cameras table
+        sa.Column(
+            "mode",
+            postgresql.ENUM(*RECORDING_MODES, name="recordingmode", create_type=False),
+            nullable=False
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["camera_id"], ["cameras.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_camera_schedules_camera_id", "camera_schedules", ["camera_id"])
+
+
+def _create_user_cameras() -> None:
+    op.create_table(
+        "user_cameras",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("camera_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["camera_id"], ["cameras.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "camera_id"),
+    )
+
+
+# (table, builder), referenced tables first
+TABLES = [
+    ("events", _create_events),
+    ("maps", _create_maps),
+    ("system_settings", _create_system_settings),
+    ("users", _create_users),
+    ("audit_logs", _create_audit_logs),
+    ("cameras", _create_cameras),
+    ("camera_schedules", _create_camera_schedules),
+    ("user_cameras", _create_user_cameras),
+]
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, create in TABLES:
+        if table not in existing:
+            create()
+
+
+def downgrade() -> None:
+    for table, _ in reversed(TABLES):
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS recordingmode")
+        op.execute("DROP TYPE IF EXISTS userrole")
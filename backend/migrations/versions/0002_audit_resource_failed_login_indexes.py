@@ -0,0 +1,40 @@
+"""Audit resource history and failed-login indexes
+
+Adds (resource_type, resource_id, timestamp) for per-resource history and
+a partial timestamp index over LOGIN_FAILED rows for security dashboards.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+FAILED_LOGIN_PREDICATE = sa.text("action = 'LOGIN_FAILED'")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_resource", "audit_logs",
+        ["resource_type", "resource_id", "timestamp"],
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_audit_failed_logins", "audit_logs",
+        ["timestamp"],
+        postgresql_where=FAILED_LOGIN_PREDICATE,
+        sqlite_where=FAILED_LOGIN_PREDICATE,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_failed_logins", table_name="audit_logs", if_exists=True)
+    op.drop_index("ix_audit_resource", table_name="audit_logs", if_exists=True)
@@ -0,0 +1,34 @@
+"""BRIN index for audit_logs.timestamp
+
+audit_logs is append-only and time-ordered, so on PostgreSQL a BRIN index
+replaces the single-column B-tree at a fraction of the size (SQLite gets
+a regular index under the new name).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_timestamp_brin", "audit_logs",
+        ["timestamp"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+        if_not_exists=True
+    )
+    op.drop_index("ix_audit_logs_timestamp", table_name="audit_logs", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_audit_logs_timestamp", "audit_logs", ["timestamp"], if_not_exists=True)
+    op.drop_index("ix_audit_timestamp_brin", table_name="audit_logs", if_exists=True)
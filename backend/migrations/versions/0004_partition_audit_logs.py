@@ -0,0 +1,162 @@
+"""Partition audit_logs by month on PostgreSQL
+
+Rebuilds audit_logs as a RANGE (timestamp) partitioned table with the
+composite (id, timestamp) primary key partitioning requires. Existing rows
+are copied into monthly partitions (plus the DEFAULT catch-all) and the id
+sequence moves to the new table, so ids keep counting from where they were.
+services/audit_partitions.py maintains the partitions from then on.
+
+Downtime: the whole rebuild runs in the migration transaction holding an
+ACCESS EXCLUSIVE lock on audit_logs - nothing can read or write the table
+until it commits. The copy is a single INSERT ... SELECT followed by the
+index builds, so the lock is held for as long as it takes to rewrite the
+table and its indexes once. docker-compose runs migrations before the app
+starts, so no audit writes are lost; on large installs schedule a
+maintenance window, or trim old audit rows first.
+
+Skipped on SQLite and on databases whose audit_logs is already partitioned
+(created by create_all from the current models).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from datetime import date, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+TABLE = "audit_logs"
+OLD_TABLE = "audit_logs_old"
+
+COLUMNS = (
+    "id", "user_id", "username", "action", "details", "ip_address",
+    "user_agent", "resource_type", "resource_id", "timestamp",
+)
+
+# Dropped from the old table (index names are schema-wide) and recreated
+# on the new one after the copy, like its user_id foreign key
+INDEX_NAMES = (
+    "ix_audit_logs_user_id",
+    "ix_audit_logs_username",
+    "ix_audit_logs_action",
+    "ix_audit_logs_resource_type",
+    "ix_audit_timestamp_brin",
+    "ix_audit_user_timestamp",
+    "ix_audit_action_timestamp",
+    "ix_audit_resource",
+    "ix_audit_failed_logins",
+)
+
+
+def _add_months(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned() -> bool:
+    return op.get_bind().scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :name)"
+    ), {"name": TABLE})
+
+
+def _create_table(partitioned: bool, sequence: str) -> None:
+    kwargs = {"postgresql_partition_by": "RANGE (timestamp)"} if partitioned else {}
+    primary_key = ("id", "timestamp") if partitioned else ("id",)
+    op.create_table(
+        TABLE,
+        sa.Column("id", sa.Integer(), server_default=sa.text(f"nextval('{sequence}'::regclass)"), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("username", sa.String(length=100), nullable=False),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("details", sa.Text(), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.String(length=500), nullable=True),
+        sa.Column("resource_type", sa.String(length=50), nullable=True),
+        sa.Column("resource_id", sa.String(length=100), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint(*primary_key),
+        **kwargs
+    )
+
+
+def _create_partitions() -> None:
+    """Monthly partitions from the oldest row through next month, plus DEFAULT."""
+    oldest = op.get_bind().scalar(sa.text(f"SELECT min(timestamp) FROM {OLD_TABLE}"))
+    this_month = date.today().replace(day=1)
+    start = oldest.astimezone(timezone.utc).date().replace(day=1) if oldest else this_month
+
+    op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    while start <= _add_months(this_month, 1):
+        end = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE {TABLE}_{start.year:04d}_{start.month:02d} "
+            f"PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') "
+            f"TO ('{end.isoformat()} 00:00:00+00')"
+        )
+        start = end
+
+
+def _create_indexes() -> None:
+    op.create_index("ix_audit_logs_user_id", TABLE, ["user_id"])
+    op.create_index("ix_audit_logs_username", TABLE, ["username"])
+    op.create_index("ix_audit_logs_action", TABLE, ["action"])
+    op.create_index("ix_audit_logs_resource_type", TABLE, ["resource_type"])
+    op.create_index(
+        "ix_audit_timestamp_brin", TABLE, ["timestamp"],
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32}
+    )
+    op.create_index("ix_audit_user_timestamp", TABLE, ["user_id", "timestamp"])
+    op.create_index("ix_audit_action_timestamp", TABLE, ["action", "timestamp"])
+    op.create_index("ix_audit_resource", TABLE, ["resource_type", "resource_id", "timestamp"])
+    op.create_index(
+        "ix_audit_failed_logins", TABLE, ["timestamp"],
+        postgresql_where=sa.text("action = 'LOGIN_FAILED'")
+    )
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Swap audit_logs for a (non-)partitioned copy of itself."""
+    sequence = op.get_bind().scalar(sa.text(f"SELECT pg_get_serial_sequence('{TABLE}', 'id')"))
+
+    op.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+    op.rename_table(TABLE, OLD_TABLE)
+    op.execute(f"ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT {TABLE}_pkey TO {OLD_TABLE}_pkey")
+    op.execute(f"ALTER TABLE {OLD_TABLE} DROP CONSTRAINT IF EXISTS {TABLE}_user_id_fkey")
+    for name in INDEX_NAMES:
+        op.drop_index(name, table_name=OLD_TABLE, if_exists=True)
+
+    _create_table(partitioned, sequence)
+    if partitioned:
+        _create_partitions()
+
+    columns = ", ".join(f'"{column}"' for column in COLUMNS)
+    op.execute(f"INSERT INTO {TABLE} ({columns}) SELECT {columns} FROM {OLD_TABLE}")
+    # Hand the sequence over before the old table (its owner) is dropped
+    op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {TABLE}.id")
+    op.drop_table(OLD_TABLE)
+
+    _create_indexes()
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or _is_partitioned():
+        return
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or not _is_partitioned():
+        return
+    _rebuild(partitioned=False)
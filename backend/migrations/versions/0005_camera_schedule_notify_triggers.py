@@ -0,0 +1,57 @@
+"""NOTIFY triggers for camera schedule changes
+
+Statement-level triggers on camera_schedules and on cameras (is_active /
+recording_mode) send pg_notify('camera_schedule_changed', <table>), which
+the scheduler LISTENs on to re-check schedules right away. Transactions
+that set titannvr.scheduler_write (the scheduler's own recording_mode
+updates) don't notify, so the scheduler isn't woken by its own writes.
+PostgreSQL only.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_camera_schedule_changed() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('titannvr.scheduler_write', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_notify('camera_schedule_changed', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP TRIGGER IF EXISTS camera_schedules_changed ON camera_schedules")
+    op.execute("""
+        CREATE TRIGGER camera_schedules_changed
+        AFTER INSERT OR UPDATE OR DELETE ON camera_schedules
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_camera_schedule_changed()
+    """)
+    op.execute("DROP TRIGGER IF EXISTS cameras_schedule_changed ON cameras")
+    op.execute("""
+        CREATE TRIGGER cameras_schedule_changed
+        AFTER INSERT OR DELETE OR UPDATE OF is_active, recording_mode ON cameras
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_camera_schedule_changed()
+    """)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP TRIGGER IF EXISTS cameras_schedule_changed ON cameras")
+    op.execute("DROP TRIGGER IF EXISTS camera_schedules_changed ON camera_schedules")
+    op.execute("DROP FUNCTION IF EXISTS notify_camera_schedule_changed()")
@@ -0,0 +1,48 @@
+"""Shrink audit_logs.user_agent to VARCHAR(200)
+
+The audit writers truncate user agents to USER_AGENT_MAX_LENGTH (200);
+existing longer values are cut to fit before the type changes.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE audit_logs ALTER COLUMN user_agent "
+            "TYPE VARCHAR(200) USING left(user_agent, 200)"
+        )
+    else:
+        op.execute(
+            "UPDATE audit_logs SET user_agent = substr(user_agent, 1, 200) "
+            "WHERE length(user_agent) > 200"
+        )
+        with op.batch_alter_table("audit_logs") as batch_op:
+            batch_op.alter_column(
+                "user_agent",
+                existing_type=sa.String(length=500),
+                type_=sa.String(length=200),
+                existing_nullable=True
+            )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("audit_logs") as batch_op:
+        batch_op.alter_column(
+            "user_agent",
+            existing_type=sa.String(length=200),
+            type_=sa.String(length=500),
+            existing_nullable=True
+        )
@@ -0,0 +1,38 @@
+"""Events time-range indexes
+
+Adds start_time-leading composite and covering indexes for the events
+list/timeline queries and drops the single-column start_time index they
+make redundant.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_start_camera_label", "events",
+        ["start_time", "camera", "label"],
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_events_start_covering", "events",
+        ["start_time", "camera", "label", "score", "has_clip", "has_snapshot"],
+        if_not_exists=True
+    )
+    op.drop_index("ix_events_start_time", table_name="events", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_events_start_time", "events", ["start_time"], if_not_exists=True)
+    op.drop_index("ix_events_start_covering", table_name="events", if_exists=True)
+    op.drop_index("ix_events_start_camera_label", table_name="events", if_exists=True)
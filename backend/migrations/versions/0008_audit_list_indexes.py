@@ -0,0 +1,38 @@
+"""Audit log list indexes
+
+Adds indexes matching the list_audit_logs filter shape and replaces the
+single-column username index with (username, timestamp).
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_ts_action_restype", "audit_logs",
+        ["timestamp", "action", "resource_type"],
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_audit_username_ts", "audit_logs",
+        ["username", "timestamp"],
+        postgresql_ops={"username": "varchar_pattern_ops"},
+        if_not_exists=True
+    )
+    op.drop_index("ix_audit_logs_username", table_name="audit_logs", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_audit_logs_username", "audit_logs", ["username"], if_not_exists=True)
+    op.drop_index("ix_audit_username_ts", table_name="audit_logs", if_exists=True)
+    op.drop_index("ix_audit_ts_action_restype", table_name="audit_logs", if_exists=True)
@@ -0,0 +1,77 @@
+"""Store users.role and cameras.recording_mode as plain strings
+
+The columns were SQLAlchemy Enums, which persist the member *names*
+('ADMIN', 'MOTION') - a native enum type on PostgreSQL, VARCHAR on SQLite.
+They now hold the lower-case values ('admin', 'motion') in VARCHAR(16).
+On SQLite the Enum columns were already VARCHAR(8) / VARCHAR(10); batch
+mode rebuilds the tables to declare the new length.
+
+PostgreSQL won't change the type of a column named in a trigger's UPDATE OF
+list, so the cameras NOTIFY trigger from 0005 is dropped around the ALTER
+and recreated unchanged.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# (table, column, PostgreSQL enum type created by SQLAlchemy, SQLite type)
+COLUMNS = [
+    ("users", "role", "userrole", sa.String(length=8)),
+    ("cameras", "recording_mode", "recordingmode", sa.String(length=10)),
+]
+
+# Same trigger as revision 0005
+CAMERAS_TRIGGER = """
+    CREATE TRIGGER cameras_schedule_changed
+    AFTER INSERT OR DELETE OR UPDATE OF is_active, recording_mode ON cameras
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_camera_schedule_changed()
+"""
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS cameras_schedule_changed ON cameras")
+        for table, column, _, _ in COLUMNS:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"TYPE VARCHAR(16) USING lower({column}::text)"
+            )
+        op.execute(CAMERAS_TRIGGER)
+        # camera_schedules.mode still uses the recordingmode type
+        op.execute("DROP TYPE IF EXISTS userrole")
+    else:
+        for table, column, _, sqlite_type in COLUMNS:
+            op.execute(f"UPDATE {table} SET {column} = lower({column})")
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, existing_type=sqlite_type, type_=sa.String(length=16))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "DO $$ BEGIN "
+            "CREATE TYPE userrole AS ENUM ('ADMIN', 'OPERATOR', 'VIEWER'); "
+            "EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+        )
+        op.execute("DROP TRIGGER IF EXISTS cameras_schedule_changed ON cameras")
+        for table, column, enum_type, _ in COLUMNS:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} "
+                f"TYPE {enum_type} USING upper({column})::{enum_type}"
+            )
+        op.execute(CAMERAS_TRIGGER)
+    else:
+        for table, column, _, sqlite_type in COLUMNS:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, existing_type=sa.String(length=16), type_=sqlite_type)
+            op.execute(f"UPDATE {table} SET {column} = upper({column})")
@@ -0,0 +1,43 @@
+"""Server-side timestamp defaults for users and system_settings
+
+created_at / updated_at were filled in by Python (datetime.utcnow); the
+database now supplies them with CURRENT_TIMESTAMP. SQLite can't alter a
+column default in place, so batch mode rebuilds those tables.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+TABLES = ["users", "system_settings"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            for column in ("created_at", "updated_at"):
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    server_default=sa.func.now()
+                )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            for column in ("created_at", "updated_at"):
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.DateTime(),
+                    server_default=None
+                )
@@ -0,0 +1,33 @@
+"""Store cameras.zones_config as JSONB on PostgreSQL
+
+SQLite keeps text JSON (binary jsonb needs SQLite 3.45+), so this is a
+no-op there.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE cameras ALTER COLUMN zones_config "
+            "TYPE JSONB USING zones_config::jsonb"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE cameras ALTER COLUMN zones_config "
+            "TYPE JSON USING zones_config::json"
+        )
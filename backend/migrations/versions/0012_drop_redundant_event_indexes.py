@@ -0,0 +1,27 @@
+"""Drop single-column camera/label indexes on events
+
+ix_events_camera_start and ix_events_label_start already serve lookups on
+their leading column; the standalone indexes only cost writes on ingest.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_events_camera", table_name="events", if_exists=True)
+    op.drop_index("ix_events_label", table_name="events", if_exists=True)
+
+
+def downgrade() -> None:
+    op.create_index("ix_events_label", "events", ["label"], if_not_exists=True)
+    op.create_index("ix_events_camera", "events", ["camera"], if_not_exists=True)